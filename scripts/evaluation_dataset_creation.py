@@ -5,7 +5,9 @@ Generates JSONL files in AWS Bedrock conversationTurns format.
 
 import json
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import best_match
 from loguru import logger
 
 # F1 evaluation questions covering different regulation categories
@@ -87,11 +89,152 @@ EVALUATION_QUESTIONS = [
 ]
 
 
+# JSON Schema for one record of the Bedrock conversationTurns format
+_TEXT_CONTENT_SCHEMA = {
+    "type": "array",
+    "minItems": 1,
+    "prefixItems": [
+        {"type": "object", "required": ["text"]}
+    ]
+}
+
+RECORD_SCHEMA = {
+    "type": "object",
+    "required": ["conversationTurns"],
+    "properties": {
+        "conversationTurns": {
+            "type": "array",
+            "minItems": 1,
+            "maxItems": 5,
+            "items": {
+                "type": "object",
+                "required": ["prompt"],
+                "properties": {
+                    "prompt": {
+                        "type": "object",
+                        "required": ["content"],
+                        "properties": {
+                            "content": _TEXT_CONTENT_SCHEMA
+                        }
+                    },
+                    "referenceResponses": {
+                        "type": "array",
+                        "prefixItems": [
+                            {
+                                "type": "object",
+                                "required": ["content"],
+                                "properties": {
+                                    "content": {
+                                        "type": "array",
+                                        "prefixItems": [
+                                            {"type": "object", "required": ["text"]}
+                                        ]
+                                    }
+                                }
+                            }
+                        ]
+                    }
+                }
+            }
+        }
+    }
+}
+
+# Schema is checked once here, so per-record validation skips that work
+RECORD_VALIDATOR = Draft202012Validator(RECORD_SCHEMA)
+
+
+def _build_record(item: Dict) -> Dict:
+    """
+    Build a single-turn conversationTurns record for one question.
+    
+    Args:
+        item: Evaluation question with prompt and optional referenceResponse
+    
+    Returns:
+        Record dict in AWS Bedrock conversationTurns format
+    """
+    # Build conversation turn structure
+    conversation_turn = {
+        "prompt": {
+            "content": [
+                {"text": item["prompt"]}
+            ]
+        }
+    }
+    
+    # Add reference response if available
+    if "referenceResponse" in item:
+        conversation_turn["referenceResponses"] = [
+            {
+                "content": [
+                    {"text": item["referenceResponse"]}
+                ]
+            }
+        ]
+    
+    # Wrap in conversationTurns array (single turn per record)
+    return {
+        "conversationTurns": [conversation_turn]
+    }
+
+
+def build_records(questions: List[Dict]) -> List[Dict]:
+    """
+    Build conversationTurns records (with reference responses) for all questions.
+    
+    Args:
+        questions: List of evaluation questions with reference responses
+    
+    Returns:
+        List of records in AWS Bedrock conversationTurns format
+    """
+    total = len(questions)
+    records = []
+    
+    for idx, item in enumerate(questions, 1):
+        records.append(_build_record(item))
+        
+        # Lazy: message (and prompt slice) only built if DEBUG is enabled
+        logger.opt(lazy=True).debug(
+            "Added question {}/{}: {}...",
+            lambda i=idx: i,
+            lambda: total,
+            lambda p=item["prompt"]: p[:50]
+        )
+    
+    return records
+
+
+def strip_reference_responses(records: List[Dict]) -> None:
+    """
+    Remove referenceResponses from already-built records, in place.
+    
+    Derives the prompts-only variant without rebuilding the records.
+    """
+    for record in records:
+        for turn in record["conversationTurns"]:
+            turn.pop("referenceResponses", None)
+
+
+def _record_error(record: Dict) -> Optional[str]:
+    """
+    Check one record against RECORD_SCHEMA.
+    
+    Returns:
+        Description of the most relevant schema violation, or None if valid
+    """
+    error = best_match(RECORD_VALIDATOR.iter_errors(record))
+    if error is None:
+        return None
+    return f"{error.json_path}: {error.message}"
+
+
 def create_bedrock_format_dataset(
     output_path: Path,
-    questions: List[Dict],
+    records: List[Dict],
     include_reference_responses: bool = True
-) -> None:
+) -> bool:
     """
     Create evaluation dataset in AWS Bedrock's conversationTurns JSONL format.
     
@@ -112,185 +255,47 @@ def create_bedrock_format_dataset(
     }
     
     Args:
-        output_path: Path to save the JSONL file
-        questions: List of evaluation questions with reference responses
-        include_reference_responses: Whether to include reference responses
+        output_path: Path to save the JSONL file (parent directory must exist)
+        records: Records built by build_records
+        include_reference_responses: Whether records carry reference responses
+            (used for reporting)
+    
+    Returns:
+        True if every record passed schema validation, False otherwise
     """
     logger.info(f"Creating AWS Bedrock evaluation dataset: {output_path}")
     
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # Validate in memory so the written file never has to be re-read.
+    # Errors are collected and logged in one call rather than per record.
+    errors = [
+        f"❌ Record {record_num}: {error}"
+        for record_num, record in enumerate(records, 1)
+        if (error := _record_error(record)) is not None
+    ]
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        for idx, item in enumerate(questions, 1):
-            # Build conversation turn structure
-            conversation_turn = {
-                "prompt": {
-                    "content": [
-                        {"text": item["prompt"]}
-                    ]
-                }
-            }
-            
-            # Add reference response if requested
-            if include_reference_responses and "referenceResponse" in item:
-                conversation_turn["referenceResponses"] = [
-                    {
-                        "content": [
-                            {"text": item["referenceResponse"]}
-                        ]
-                    }
-                ]
-            
-            # Wrap in conversationTurns array (single turn per record)
-            record = {
-                "conversationTurns": [conversation_turn]
-            }
-            
-            # Write as JSON line
-            f.write(json.dumps(record, ensure_ascii=False) + '\n')
-            
-            logger.debug(
-                f"Added question {idx}/{len(questions)}: "
-                f"{item['prompt'][:50]}..."
-            )
+    # Serialize and encode once, then write raw bytes (no text codec layer)
+    payload = (
+        '\n'.join(json.dumps(record, ensure_ascii=False) for record in records)
+        + '\n'
+    ).encode('utf-8')
+    with open(output_path, 'wb', buffering=1 << 20) as f:
+        f.write(payload)
     
     logger.success(
-        f"✅ Created dataset with {len(questions)} questions: {output_path}"
+        f"✅ Created dataset with {len(records)} questions: {output_path}"
     )
     logger.info(f"   Format: AWS Bedrock conversationTurns structure")
     logger.info(
         f"   Reference responses: "
         f"{'Included' if include_reference_responses else 'Not included'}"
     )
-
-
-def validate_dataset(file_path: Path) -> bool:
-    """
-    Validate dataset format matches AWS Bedrock requirements.
-    
-    Args:
-        file_path: Path to JSONL dataset file
-    
-    Returns:
-        True if valid, False otherwise
-    """
-    logger.info(f"Validating dataset: {file_path}")
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            line_num = 0
-            for line in f:
-                line_num += 1
-                
-                # Parse JSON
-                try:
-                    record = json.loads(line)
-                except json.JSONDecodeError as e:
-                    logger.error(f"❌ Line {line_num}: Invalid JSON - {e}")
-                    return False
-                
-                # Check required structure
-                if "conversationTurns" not in record:
-                    logger.error(
-                        f"❌ Line {line_num}: Missing 'conversationTurns' key"
-                    )
-                    return False
-                
-                if not isinstance(record["conversationTurns"], list):
-                    logger.error(
-                        f"❌ Line {line_num}: 'conversationTurns' must be array"
-                    )
-                    return False
-                
-                if len(record["conversationTurns"]) == 0:
-                    logger.error(
-                        f"❌ Line {line_num}: 'conversationTurns' is empty"
-                    )
-                    return False
-                
-                if len(record["conversationTurns"]) > 5:
-                    logger.error(
-                        f"❌ Line {line_num}: Too many turns "
-                        f"({len(record['conversationTurns'])} > 5 max)"
-                    )
-                    return False
-                
-                # Validate each turn
-                for turn_idx, turn in enumerate(record["conversationTurns"]):
-                    if "prompt" not in turn:
-                        logger.error(
-                            f"❌ Line {line_num}, Turn {turn_idx+1}: "
-                            f"Missing 'prompt' key"
-                        )
-                        return False
-                    
-                    if "content" not in turn["prompt"]:
-                        logger.error(
-                            f"❌ Line {line_num}, Turn {turn_idx+1}: "
-                            f"Missing 'prompt.content'"
-                        )
-                        return False
-                    
-                    if not isinstance(turn["prompt"]["content"], list):
-                        logger.error(
-                            f"❌ Line {line_num}, Turn {turn_idx+1}: "
-                            f"'prompt.content' must be array"
-                        )
-                        return False
-                    
-                    if len(turn["prompt"]["content"]) == 0:
-                        logger.error(
-                            f"❌ Line {line_num}, Turn {turn_idx+1}: "
-                            f"'prompt.content' is empty"
-                        )
-                        return False
-                    
-                    if "text" not in turn["prompt"]["content"][0]:
-                        logger.error(
-                            f"❌ Line {line_num}, Turn {turn_idx+1}: "
-                            f"Missing 'prompt.content[0].text'"
-                        )
-                        return False
-                    
-                    # Validate referenceResponses if present
-                    if "referenceResponses" in turn:
-                        if not isinstance(turn["referenceResponses"], list):
-                            logger.error(
-                                f"❌ Line {line_num}, Turn {turn_idx+1}: "
-                                f"'referenceResponses' must be array"
-                            )
-                            return False
-                        
-                        if len(turn["referenceResponses"]) > 0:
-                            ref_resp = turn["referenceResponses"][0]
-                            if "content" not in ref_resp:
-                                logger.error(
-                                    f"❌ Line {line_num}, Turn {turn_idx+1}: "
-                                    f"Missing 'referenceResponses[0].content'"
-                                )
-                                return False
-                            
-                            if not isinstance(ref_resp["content"], list):
-                                logger.error(
-                                    f"❌ Line {line_num}, Turn {turn_idx+1}: "
-                                    f"'referenceResponses[0].content' must be array"
-                                )
-                                return False
-                            
-                            if (len(ref_resp["content"]) > 0 and 
-                                "text" not in ref_resp["content"][0]):
-                                logger.error(
-                                    f"❌ Line {line_num}, Turn {turn_idx+1}: "
-                                    f"Missing 'referenceResponses[0].content[0].text'"
-                                )
-                                return False
-        
-        logger.success(f"✅ Dataset is valid! ({line_num} records)")
-        return True
-        
-    except Exception as e:
-        logger.error(f"❌ Validation error: {e}")
+    if errors:
+        logger.error("\n".join(errors))
         return False
+    
+    logger.success(f"✅ Dataset is valid! ({len(records)} records)")
+    return True
 
 
 def main():
@@ -299,46 +304,44 @@ def main():
     logger.info("Creating AWS Bedrock Evaluation Datasets")
     logger.info("="*70)
     
-    # Output directory
+    # Output directory (created once for both datasets)
     output_dir = Path("evaluation_datasets")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Records are built once; both datasets are written from them
+    records = build_records(EVALUATION_QUESTIONS)
+    total = len(records)
     
     # 1. Full dataset with reference responses (MAIN DATASET)
     main_dataset = output_dir / "f1-kb-evaluation-bedrock.jsonl"
-    create_bedrock_format_dataset(
+    main_valid = create_bedrock_format_dataset(
         output_path=main_dataset,
-        questions=EVALUATION_QUESTIONS,
+        records=records,
         include_reference_responses=True
     )
     
     # 2. Prompts-only dataset (no reference responses)
+    strip_reference_responses(records)
     prompts_only = output_dir / "f1-kb-evaluation-prompts-only.jsonl"
-    create_bedrock_format_dataset(
+    prompts_valid = create_bedrock_format_dataset(
         output_path=prompts_only,
-        questions=EVALUATION_QUESTIONS,
+        records=records,
         include_reference_responses=False
     )
     
-    # 3. Validate datasets
-    logger.info("\n" + "="*70)
-    logger.info("Validating Datasets")
-    logger.info("="*70)
-    
-    main_valid = validate_dataset(main_dataset)
-    prompts_valid = validate_dataset(prompts_only)
-    
-    # 4. Summary
+    # 3. Summary (records were validated in memory while building)
     logger.info("\n" + "="*70)
     logger.success("Evaluation Dataset Creation Complete!")
     logger.info("="*70)
     logger.info(f"\n📊 Generated Files:")
     logger.info(f"   1. {main_dataset}")
-    logger.info(f"      ├─ Questions: {len(EVALUATION_QUESTIONS)}")
+    logger.info(f"      ├─ Questions: {total}")
     logger.info(f"      ├─ Reference responses: ✅ Included")
     logger.info(
         f"      └─ Validation: {'✅ PASSED' if main_valid else '❌ FAILED'}"
     )
     logger.info(f"\n   2. {prompts_only}")
-    logger.info(f"      ├─ Questions: {len(EVALUATION_QUESTIONS)}")
+    logger.info(f"      ├─ Questions: {total}")
     logger.info(f"      ├─ Reference responses: ❌ Not included")
     logger.info(
         f"      └─ Validation: {'✅ PASSED' if prompts_valid else '❌ FAILED'}"
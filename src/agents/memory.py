@@ -0,0 +1,136 @@
+"""
+Fact-based conversation memory (Mem0-style).
+
+Instead of resending the conversation on every turn, each finished exchange
+is distilled once into short standalone facts (write path). At query time
+only the few facts most relevant to the new query are sent to the model
+(read path), so prompt size stays flat as the conversation grows.
+"""
+
+import heapq
+import threading
+from typing import List, Tuple
+from loguru import logger
+from openai import OpenAI
+
+from src.config.settings import settings
+
+
+FACT_EXTRACTION_PROMPT = (
+    "Extract the facts worth remembering from this F1 assistant exchange. "
+    "One short standalone fact per line (e.g. 'User asked about the Monaco circuit', "
+    "'1st place scores 25 points'). No numbering, no commentary. "
+    "Reply with nothing if there is nothing worth remembering."
+)
+
+
+class FactMemory:
+    """
+    Per-conversation store of extracted facts with embedding retrieval.
+
+    Facts are embedded with OpenAI embeddings, which are unit-length, so a
+    dot product is the cosine similarity. Conversations hold at most a few
+    hundred facts, so a linear scan is fast enough without a vector index.
+    """
+
+    def __init__(self, client: OpenAI, max_facts: int = 200):
+        """
+        Initialize an empty fact memory.
+
+        Args:
+            client: OpenAI client used for extraction and embeddings
+            max_facts: Facts kept per conversation (oldest dropped first)
+        """
+        self.client = client
+        self.max_facts = max_facts
+        self._facts: List[Tuple[str, List[float]]] = []
+        self._lock = threading.Lock()
+
+    def extract_facts(self, user_msg: str, assistant_msg: str) -> List[str]:
+        """
+        Distill one exchange into standalone facts (one LLM call).
+
+        Args:
+            user_msg: User's message
+            assistant_msg: Assistant's reply
+
+        Returns:
+            List of fact strings (possibly empty)
+        """
+        response = self.client.chat.completions.create(
+            model=settings.openai_summary_model,
+            messages=[
+                {"role": "system", "content": FACT_EXTRACTION_PROMPT},
+                {"role": "user", "content": f"User: {user_msg}\nAssistant: {assistant_msg}"}
+            ],
+            max_tokens=200,
+            temperature=0
+        )
+        text = response.choices[0].message.content or ""
+
+        return [line.lstrip("-• ").strip() for line in text.splitlines() if line.strip()]
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in a single API call."""
+        response = self.client.embeddings.create(
+            model=settings.openai_embedding_model,
+            input=texts
+        )
+        return [item.embedding for item in response.data]
+
+    def store(self, facts: List[str]):
+        """
+        Embed and store facts.
+
+        Args:
+            facts: Fact strings to remember
+        """
+        if not facts:
+            return
+
+        vectors = self._embed(facts)
+
+        with self._lock:
+            self._facts.extend(zip(facts, vectors))
+            del self._facts[:-self.max_facts]
+
+    def remember(self, user_msg: str, assistant_msg: str):
+        """
+        Extract and store facts from one exchange.
+
+        Meant to run in the background after a response is returned; errors
+        are logged, never raised.
+        """
+        try:
+            facts = self.extract_facts(user_msg, assistant_msg)
+            self.store(facts)
+            logger.debug("Stored {} conversation facts", len(facts))
+        except Exception as e:
+            logger.warning(f"Fact extraction failed: {e}")
+
+    def retrieve(self, query: str, k: int = 5) -> List[str]:
+        """
+        Return the k stored facts most similar to the query.
+
+        Args:
+            query: User's new query
+            k: Number of facts to return
+
+        Returns:
+            Facts, most relevant first (empty if nothing is stored)
+        """
+        with self._lock:
+            facts = list(self._facts)
+
+        if not facts:
+            return []
+        if len(facts) <= k:
+            return [fact for fact, _ in facts]
+
+        query_vector = self._embed([query])[0]
+        top = heapq.nlargest(
+            k,
+            facts,
+            key=lambda item: sum(q * v for q, v in zip(query_vector, item[1]))
+        )
+        return [fact for fact, _ in top]
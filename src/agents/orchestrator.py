@@ -8,15 +8,166 @@ No hardcoded routing or aliases - LLM understands queries naturally.
 Supports both GPT-4o and GPT-5 Mini models.
 """
 
-import json
-from typing import Dict, Any, List, Optional
+import asyncio
+import contextvars
+import hashlib
+import re
+import string
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Any, Iterator, List, Optional, Tuple
+import orjson
 from loguru import logger
 from langsmith import traceable
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI, Timeout
 
+try:
+    # Connection limits come from the HTTP library the openai SDK is built on
+    from httpx2 import Limits
+except ImportError:
+    from httpx import Limits
+
+from src.agents.memory import FactMemory
+from src.agents.router import EmbeddingRouter
 from src.config.settings import settings
-from src.tools.circuit_retrieval import get_circuit_retrieval
-from src.tools.regulations_rag import get_regulations_rag
+from src.tools.circuit_retrieval import CircuitRetrieval, get_circuit_retrieval
+
+if TYPE_CHECKING:
+    # Imported lazily in regulations_tool: boto3/botocore are slow to import
+    from src.tools.regulations_rag import RegulationsRAG
+
+
+# System prompt for the tool-calling agent (sent on every call, so kept short)
+SYSTEM_PROMPT = (
+    "F1 assistant. Call tools immediately, each once, no preamble; "
+    "both in parallel for combined queries. Use history for follow-ups. "
+    "After tool results, reply in 1-2 sentences. Never ask questions."
+)
+
+# OpenAI connection pool: long-lived keepalive so turns reuse pooled
+# connections instead of paying a new TCP + TLS handshake
+HTTP_LIMITS = Limits(max_keepalive_connections=64, max_connections=128, keepalive_expiry=300)
+HTTP_TIMEOUT = Timeout(60.0, connect=5.0)
+
+# Conversation messages sent verbatim; older ones are replaced by a summary
+HISTORY_WINDOW = 20
+
+# History is trimmed this many messages at a time rather than one exchange
+# per turn, so the verbatim part (and OpenAI's cached prompt prefix) stays
+# unchanged for several turns between trims
+HISTORY_TRIM_STEP = 10
+
+# Fact memory mode: relevant facts retrieved per query, and how many of the
+# latest messages are still sent verbatim (for follow-ups like "and there?")
+FACT_MEMORY_TOP_K = 5
+FACT_MEMORY_WINDOW = 2
+
+# Tool calls run at once per query; a combined query can ask for several
+# circuits plus regulations, so two workers would queue the third call
+TOOL_WORKERS = 4
+
+# Cached standalone-query responses: max entries and lifetime (seconds)
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_TTL = 3600
+
+_PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+
+# Max cached history summaries (oldest evicted first)
+SUMMARY_CACHE_SIZE = 128
+
+SUMMARY_PROMPT = (
+    "Summarize this F1 assistant conversation in at most 3 sentences. "
+    "Keep circuits, regulations and facts the user asked about; drop pleasantries."
+)
+
+# Tool schemas sent with every routing call. Built once at import and shared
+# by all agents: the same object each call, and a byte-identical tools prefix
+# for OpenAI prompt caching. Descriptions are kept short: the model knows the
+# F1 calendar, and the circuit tool resolves names itself.
+
+TOOLS: List[Dict[str, Any]] = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_circuit_image",
+            "description": "F1 circuit map image by location.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "location": {
+                        "type": "string",
+                        "description": "Circuit or country, e.g. Monaco, Las_Vegas, USA (for COTA)"
+                    }
+                },
+                "required": ["location"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "query_regulations",
+            "description": (
+                "FIA F1 sporting, technical and financial regulations: "
+                "rules, points, DRS, safety car, penalties, etc."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "question": {
+                        "type": "string",
+                        "description": "Regulation question (e.g., 'points for 1st', 'DRS rules')"
+                    }
+                },
+                "required": ["question"]
+            }
+        }
+    }
+]
+
+# Plain circuit requests ("show me Monaco", "display the Las Vegas track map")
+# are answered from the circuit tool without any LLM turn. Only a verb, one
+# known circuit name and an optional noun are allowed, so anything longer
+# (combined queries, follow-ups) still goes to the LLM.
+_CIRCUIT_NAMES = sorted(
+    {
+        name
+        for circuit in CircuitRetrieval.CIRCUIT_LOCATIONS
+        for name in (
+            circuit.lower(),
+            circuit.lower().replace("_", " "),
+            *(part for part in circuit.lower().split("_") if len(part) > 3)
+        )
+    },
+    key=len,
+    reverse=True
+)
+_CIRCUIT_QUERY_PATTERN = re.compile(
+    r"^\s*(?:please\s+)?(?:show|display|view)(?:\s+me)?(?:\s+the)?\s+"
+    r"(?P<location>" + "|".join(re.escape(name) for name in _CIRCUIT_NAMES) + r")"
+    r"(?:\s+(?:circuit|track))?(?:\s+(?:map|layout))?\s*[.!?]*\s*$",
+    re.IGNORECASE
+)
+_CIRCUIT_ANSWER = "Here is the {} circuit map."
+
+# Token cap for the final summary turn (GPT-4o; GPT-5 reasoning tokens count
+# against its limit, so it is left uncapped)
+FINAL_RESPONSE_MAX_TOKENS = 60
+
+# Fixed system message shared by every query (never mutated, so no per-query copies)
+_SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+
+@dataclass(slots=True)
+class ToolCall:
+    """A decoded tool call from an assistant message."""
+    id: str
+    name: str
+    args: Dict[str, Any]
 
 
 class Orchestrator:
@@ -30,139 +181,148 @@ class Orchestrator:
     No hardcoded logic - agent decides which tools to use based on query.
     """
 
-    def __init__(self):
-        """Initialize orchestrator agent with tools."""
+    def __init__(self, model: Optional[str] = None):
+        """
+        Initialize orchestrator agent with tools.
+        
+        Args:
+            model: OpenAI model name (default: settings.openai_model)
+        """
         logger.info("Initializing F1 Orchestrator Agent with tool calling")
         
-        # Initialize OpenAI client
-        self.client = OpenAI(api_key=settings.openai_api_key)
-        self.model = settings.openai_model
+        # Initialize OpenAI clients on long-lived pooled connections (the SDK's
+        # default HTTP clients, with our limits and timeout)
+        self.client = OpenAI(
+            api_key=settings.openai_api_key,
+            http_client=DefaultHttpxClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        )
+        self.async_client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=DefaultAsyncHttpxClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        )
+        self.model = model or settings.openai_model
         logger.info(f"  • Model: {self.model}")
         
-        # Initialize tools
-        try:
-            self.circuit_tool = get_circuit_retrieval()
-            logger.info("  ✓ Circuit retrieval tool loaded")
-        except Exception as e:
-            logger.error(f"Failed to initialize circuit tool: {e}")
-            raise
+        # Tools are created on first use (see circuit_tool / regulations_tool)
         
-        try:
-            self.regulations_tool = get_regulations_rag()
-            logger.info("  ✓ Regulations RAG tool loaded")
-        except Exception as e:
-            logger.error(f"Failed to initialize regulations tool: {e}")
-            raise
+        # History prefix hash -> summary, reused across turns
+        self._summary_cache: Dict[str, str] = {}
         
-        # Define tool schemas for OpenAI function calling
-        self.tools = self._define_tools()
+        # Final responses to standalone queries: (created_at, result), LRU + TTL
+        self._response_cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        
+        # Fact memories by conversation key (AGENT_MEMORY=facts), filled in
+        # by a background worker so extraction never delays a response
+        self._fact_memories: Dict[str, FactMemory] = {}
+        
+        # Optional embedding router (AGENT_ROUTER=embedding): confident
+        # regulations queries skip the LLM routing turn
+        self._router = EmbeddingRouter(self.client) if settings.agent_router == "embedding" else None
+        self._memory_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory")
+        
+        # Worker threads for running parallel tool calls concurrently
+        # (both tools are I/O-bound HTTP calls)
+        self._executor = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="tool")
+        
+        # Event loop for stream_query, started on first use. One long-lived
+        # loop, because the async client's pooled connections belong to the
+        # loop that opened them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        
+        # Tool schemas for OpenAI function calling (shared module constant)
+        self.tools = TOOLS
         logger.info(f"  ✓ {len(self.tools)} tools bound to agent")
         
         logger.success("F1 Orchestrator Agent initialized")
 
-    def _define_tools(self) -> List[Dict[str, Any]]:
+    def _warm_connection(self):
+        """Make one cheap API call to establish the pooled connection."""
+        try:
+            self.client.models.retrieve(self.model)
+            logger.debug("OpenAI connection warmed up")
+        except Exception as e:
+            logger.debug(f"OpenAI connection warm-up failed: {e}")
+
+    def warm_up(self):
         """
-        Define OpenAI function calling schemas for available tools.
+        Initialize both tools and the OpenAI connection ahead of the first query.
         
-        Returns:
-            List of tool definitions in OpenAI format
-        """
-        # Get available circuits for description
-        available_circuits = self.circuit_tool.list_available_circuits()
-        circuits_str = ", ".join(available_circuits[:10]) + "..."
-        
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_circuit_image",
-                    "description": (
-                        f"Get F1 circuit map image. Available: {circuits_str}. "
-                        f"Returns .webp image path. Use for queries like 'show Monaco', 'display Vegas circuit'. "
-                        f"Pass location as: Monaco, Las_Vegas, Great_Britain, USA (for COTA), etc."
-                    ),
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "location": {
-                                "type": "string",
-                                "description": "Circuit name: Monaco, Las_Vegas, Great_Britain, USA, etc."
-                            }
-                        },
-                        "required": ["location"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "query_regulations",
-                    "description": (
-                        "Query FIA F1 regulations including Financial Regulations, Power Unit Financial Regulations, Sporting Regulations, and Technical Regulations. Use for rules, points, DRS, safety car, penalties, etc. "
-                        "Returns official FIA regulation text with citations. Fast: 4-5s response."
-                    ),
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "question": {
-                                "type": "string",
-                                "description": "Regulation question (e.g., 'points for 1st', 'DRS rules')"
-                            }
-                        },
-                        "required": ["question"]
-                    }
-                }
-            }
-        ]
+        Tools are otherwise created on first use, so scripts that only need
+        one tool don't pay for the other. Long-running apps should call this
+        (e.g. in a background thread) at startup so the first user query
+        doesn't pay for boto3 import, Bedrock client setup, image loading
+        and the TLS handshake.
+        """
+        self._warm_connection()
+        
+        for tool_name in ("circuit_tool", "regulations_tool"):
+            try:
+                getattr(self, tool_name)
+            except Exception as e:
+                logger.warning(f"Warm-up failed for {tool_name}: {e}")
 
-    @traceable(name="Orchestrator-process_query", tags=["agent", "orchestrator", "tool-calling"])
-    def process_query(
-        self, 
+    @cached_property
+    def circuit_tool(self) -> CircuitRetrieval:
+        """Circuit retrieval tool, initialized on first use."""
+        try:
+            tool = get_circuit_retrieval()
+        except Exception as e:
+            logger.error(f"Failed to initialize circuit tool: {e}")
+            raise
+        logger.info("  ✓ Circuit retrieval tool loaded")
+        return tool
+
+    @cached_property
+    def regulations_tool(self) -> "RegulationsRAG":
+        """Regulations RAG tool (Bedrock client), imported and initialized on first use."""
+        try:
+            from src.tools.regulations_rag import get_regulations_rag
+            tool = get_regulations_rag()
+        except Exception as e:
+            logger.error(f"Failed to initialize regulations tool: {e}")
+            raise
+        logger.info("  ✓ Regulations RAG tool loaded")
+        return tool
+
+    def _build_messages(
+        self,
         query: str,
-        conversation_history: Optional[List[Dict[str, str]]] = None
-    ) -> Dict[str, Any]:
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        facts: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Process user query using Orchestrator agent with tool calling.
-        
-        Agent decides which tools to call based on query understanding.
-        Supports conversation memory for follow-up questions.
+        Build the initial message list: system prompt, recent history, query.
         
         Args:
             query: User's F1 information query
             conversation_history: Previous conversation messages for context
-            Format: [{"role": "user", "content": "..."}, 
-                    {"role": "assistant", "content": "..."}, ...]
-            Typically provided by Streamlit session state
+            facts: Remembered facts relevant to the query (fact memory mode)
             
         Returns:
-            Dict with response, tools_used, and metadata
+            Messages in OpenAI chat format
         """
-        logger.info(f"Processing query: '{query}'")
-        
-        # Initialize conversation with highly optimized system prompt
-        messages = [
-            {
-                "role": "system",
-                "content": (
-                    "You are an ultra-fast F1 assistant. RULES:\n"
-                    "1. Call tools IMMEDIATELY in first response - NO explanation before calling\n"
-                    "2. For circuit queries: call get_circuit_image(location) ONCE only\n"
-                    "3. For regulation queries: call query_regulations(question) ONCE only\n"
-                    "4. For combined queries: call BOTH tools in PARALLEL (same response)\n"
-                    "5. After tool results: give SHORT 1-2 sentence summary\n"
-                    "6. NEVER ask follow-up questions - just use the tools\n"
-                    "7. Trust tool results - don't verify or double-check\n"
-                    "8. Use conversation history for context on follow-up questions\n"
-                    "SPEED IS CRITICAL. Be decisive and concise."
-                )
-            }
-        ]
+        # Stable prefix first (system prompt, then history), per-query context
+        # last, so OpenAI's prompt cache matches as much as possible
+        messages = [_SYSTEM_MESSAGE]
         
-        # Add conversation history if provided (limit to last 10 exchanges)
+        # Add conversation history if provided (at most HISTORY_WINDOW messages)
         if conversation_history:
-            # Keep only last 20 messages (10 user + 10 assistant exchanges)
-            recent_history = conversation_history[-20:]
-            logger.debug(f"Including {len(recent_history)} previous messages for context")
+            excess = len(conversation_history) - HISTORY_WINDOW
+            cut = -(-excess // HISTORY_TRIM_STEP) * HISTORY_TRIM_STEP if excess > 0 else 0
+            recent_history = conversation_history[cut:]
+            logger.debug("Including {} previous messages for context", len(recent_history))
+            
+            # Anything older is carried as a short summary instead of verbatim
+            older_history = conversation_history[:cut]
+            if older_history:
+                summary = self._summarize_history(older_history)
+                if summary:
+                    messages.append({
+                        "role": "system",
+                        "content": f"Summary of earlier conversation: {summary}"
+                    })
             
             # Add history to messages
             for msg in recent_history:
@@ -174,146 +334,916 @@ class Orchestrator:
                     "content": msg["content"]
                 })
         
+        if facts:
+            messages.append({
+                "role": "system",
+                "content": "Known from earlier conversation:\n" + "\n".join(f"- {fact}" for fact in facts)
+            })
+        
         # Add current user query
         messages.append({
             "role": "user",
             "content": query
         })
         
-        tools_used = []
-        tool_results = {}
-        max_iterations = 2  # Hard limit: 1 for tools, 1 for response
-        iteration = 0
+        return messages
+
+    def _fact_memory(self, cache_key: str) -> FactMemory:
+        """Get or create the fact memory for a conversation."""
+        if cache_key not in self._fact_memories:
+            self._fact_memories[cache_key] = FactMemory(self.client)
+        return self._fact_memories[cache_key]
+
+    def _remember(self, memory: Optional[FactMemory], query: str, answer: Optional[str]):
+        """Queue fact extraction for a finished exchange (no-op outside fact mode)."""
+        if memory is not None and answer:
+            self._memory_executor.submit(memory.remember, query, answer)
+
+    @staticmethod
+    def _history_key(history: List[Dict[str, str]]) -> str:
+        """Hash a run of conversation messages (role + content)."""
+        digest = hashlib.blake2b(digest_size=16)
+        for msg in history:
+            digest.update(f"{msg['role']}\x00{msg['content']}\x00".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _summarize_history(self, history: List[Dict[str, str]]) -> Optional[str]:
+        """
+        Summarize messages that fell out of the history window.
+        
+        Summaries are cached by message prefix. When the previous trim's
+        prefix is cached, only the newly evicted block is folded into its
+        summary (recursive summary) rather than re-reading everything.
         
-        while iteration < max_iterations:
-            iteration += 1
-            logger.debug(f"Agent iteration {iteration}")
+        Args:
+            history: Messages older than the history window
             
-            try:
-                # Call model with tools
-                # Optimized for maximum speed with guardrails
-                is_gpt5 = self.model.startswith('gpt-5')
-                
-                if is_gpt5:
-                    # GPT-5: No parameter support, but still fast with good prompts
-                    response = self.client.chat.completions.create(
-                        model=self.model,
-                        messages=messages,
-                        tools=self.tools,
-                        parallel_tool_calls=True  # GPT-5 supports parallel calls
-                    )
-                else:
-                    # GPT-4o: Full optimization
-                    response = self.client.chat.completions.create(
-                        model=self.model,
-                        messages=messages,
-                        tools=self.tools,
-                        temperature=0.05,  # Ultra-low = fastest, most deterministic
-                        max_tokens=150,  # Very strict limit (was 300)
-                        parallel_tool_calls=True,  # Call multiple tools at once
-                        top_p=0.85,  # Focus on most likely tokens
-                        frequency_penalty=0.0,  # No penalty for speed
-                        presence_penalty=0.0  # No penalty for speed
-                    )
-                
-                message = response.choices[0].message
-                
-                # Check if agent wants to call tools
-                if not message.tool_calls:
-                    # Agent provided final answer
-                    logger.success(f"Agent completed in {iteration} iterations")
-                    return {
-                        "type": "success",
-                        "content": message.content,
-                        "tools_used": tools_used,
-                        "tool_results": tool_results,
-                        "metadata": {
-                            "iterations": iteration,
-                            "model": self.model,
-                            "query": query
-                        }
-                    }
-                
-                # Add assistant message to conversation
-                messages.append({
-                    "role": "assistant",
-                    "content": message.content,
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments
-                            }
-                        }
-                        for tc in message.tool_calls
-                    ]
-                })
-                
-                # Execute tool calls (parallel execution)
-                tool_call_results = []
-                for tool_call in message.tool_calls:
-                    tool_name = tool_call.function.name
-                    tool_args = json.loads(tool_call.function.arguments)
-                    
-                    logger.debug(f"Agent calling tool: {tool_name}({tool_args})")
-                    tools_used.append(tool_name)
-                    
-                    # Execute tool
-                    result = self._execute_tool(tool_name, tool_args)
-                    tool_results[tool_name] = result
-                    
-                    # Add tool result to conversation
-                    tool_call_results.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": json.dumps(result)
-                    })
-                    
-                    logger.debug(f"Tool {tool_name} result: {result.get('type')}")
-                
-                # Add all tool results at once (more efficient)
-                messages.extend(tool_call_results)
-                
-                # Guardrail: If we have tool results and this is iteration 1,
-                # force final response in next iteration
-                if iteration == 1 and tool_results:
-                    messages.append({
-                        "role": "system",
-                        "content": (
-                            "FINAL RESPONSE NOW. Use tool results. "
-                            "1 sentence max. No explanations."
-                        )
+        Returns:
+            Summary text, or None if summarization failed
+        """
+        key = self._history_key(history)
+        if key in self._summary_cache:
+            return self._summary_cache[key]
+        
+        # The window is cut in HISTORY_TRIM_STEP blocks, so the previous trim
+        # evicted everything but the last block
+        previous = None
+        if len(history) > HISTORY_TRIM_STEP:
+            previous = self._summary_cache.get(self._history_key(history[:-HISTORY_TRIM_STEP]))
+        
+        to_summarize = history[-HISTORY_TRIM_STEP:] if previous else history
+        transcript = "\n".join(f"{msg['role']}: {msg['content']}" for msg in to_summarize)
+        if previous:
+            transcript = f"Earlier summary: {previous}\n{transcript}"
+        
+        try:
+            response = self.client.chat.completions.create(
+                model=settings.openai_summary_model,
+                messages=[
+                    {"role": "system", "content": SUMMARY_PROMPT},
+                    {"role": "user", "content": transcript}
+                ],
+                max_tokens=200,
+                temperature=0
+            )
+            summary = response.choices[0].message.content
+        except Exception as e:
+            logger.warning(f"History summarization failed: {e}")
+            return None
+        
+        if len(self._summary_cache) >= SUMMARY_CACHE_SIZE:
+            self._summary_cache.pop(next(iter(self._summary_cache)))
+        self._summary_cache[key] = summary
+        
+        return summary
+
+    @staticmethod
+    def _conversation_key(
+        query: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> str:
+        """
+        Derive a stable prompt cache key for a conversation.
+        
+        Keyed on the conversation's first user message, which is the current
+        query on the first turn and stays the same on every follow-up, so all
+        turns of a conversation share one key.
+        
+        Args:
+            query: User's F1 information query
+            conversation_history: Previous conversation messages
+            
+        Returns:
+            Short hex key suitable for OpenAI's prompt_cache_key
+        """
+        first_message = next(
+            (msg["content"] for msg in conversation_history or [] if msg.get("role") == "user"),
+            query
+        )
+        digest = hashlib.blake2b(first_message.encode("utf-8"), digest_size=8).hexdigest()
+        return f"f1-conv-{digest}"
+
+    def _completion_params(
+        self,
+        messages: List[Dict[str, Any]],
+        cache_key: Optional[str] = None,
+        final: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Build chat.completions.create arguments for the configured model.
+        
+        Optimized for maximum speed with guardrails.
+        
+        Args:
+            messages: Conversation so far
+            cache_key: Prompt cache key; requests sharing it are routed to
+                the same cached prefix (conversation history) on OpenAI's side
+            final: Final-response turn after tool results: tool calls are
+                disabled (tools stay in the request so the prefix still
+                matches the cache) and the answer is kept short
+            
+        Returns:
+            Keyword arguments (also usable as a Batch API request body)
+        """
+        params = self._model_params(messages)
+        if cache_key:
+            params["prompt_cache_key"] = cache_key
+        if final:
+            params["tool_choice"] = "none"
+            del params["parallel_tool_calls"]
+            if "max_tokens" in params:
+                params["max_tokens"] = FINAL_RESPONSE_MAX_TOKENS
+        return params
+
+    def _model_params(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Model-specific chat.completions arguments (see _completion_params)."""
+        if self.model.startswith('gpt-5'):
+            # GPT-5: No parameter support, but still fast with good prompts
+            return {
+                "model": self.model,
+                "messages": messages,
+                "tools": self.tools,
+                "parallel_tool_calls": True  # GPT-5 supports parallel calls
+            }
+        
+        # GPT-4o: Full optimization
+        return {
+            "model": self.model,
+            "messages": messages,
+            "tools": self.tools,
+            "temperature": 0.05,  # Ultra-low = fastest, most deterministic
+            "max_tokens": 150,  # Very strict limit (was 300)
+            "parallel_tool_calls": True,  # Call multiple tools at once
+            "top_p": 0.85,  # Focus on most likely tokens
+            "frequency_penalty": 0.0,  # No penalty for speed
+            "presence_penalty": 0.0  # No penalty for speed
+        }
+
+    def first_turn_request(self, query: str) -> Dict[str, Any]:
+        """
+        Build the first (tool-routing) completion request for a query.
+        
+        Used for offline runs such as Batch API submissions, where the
+        tool-calling loop itself cannot run.
+        
+        Args:
+            query: User's F1 information query
+            
+        Returns:
+            chat.completions request body
+        """
+        return self._completion_params(self._build_messages(query))
+
+    def _conversation_state(
+        self,
+        query: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+        conversation_id: Optional[str]
+    ) -> Tuple[str, Optional[FactMemory]]:
+        """
+        Look up the per-conversation state for a query (no API calls).
+        
+        Returns:
+            Tuple of (prompt cache key, fact memory or None)
+        """
+        # Same key on every turn, so OpenAI reuses the cached history prefix
+        cache_key = conversation_id or self._conversation_key(query, conversation_history)
+        memory = self._fact_memory(cache_key) if settings.agent_memory == "facts" else None
+        return cache_key, memory
+
+    def _prepare_messages(
+        self,
+        query: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+        memory: Optional[FactMemory]
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the first-turn messages for a query.
+        
+        May call the summary / embedding APIs, so it only runs once the
+        query needs an LLM turn.
+        
+        Returns:
+            Messages for the first model turn
+        """
+        if memory is not None:
+            # Relevant facts stand in for the history; only the latest
+            # exchange is sent verbatim
+            return self._build_messages(
+                query,
+                (conversation_history or [])[-FACT_MEMORY_WINDOW:],
+                facts=memory.retrieve(query, k=FACT_MEMORY_TOP_K)
+            )
+        
+        return self._build_messages(query, conversation_history)
+
+    @staticmethod
+    def _parse_tool_calls(message, tools_used: List[str]) -> List[ToolCall]:
+        """
+        Decode the tool calls of an assistant message.
+        
+        Returns:
+            Decoded tool calls; names are also appended to tools_used
+        """
+        calls = [
+            ToolCall(tool_call.id, tool_call.function.name, orjson.loads(tool_call.function.arguments))
+            for tool_call in message.tool_calls
+        ]
+        for call in calls:
+            logger.debug("Agent calling tool: {}({})", call.name, call.args)
+            tools_used.append(call.name)
+        return calls
+
+    def _stream_turn(
+        self,
+        messages: List[Dict[str, Any]],
+        cache_key: str,
+        tools_used: List[str]
+    ) -> Tuple[Optional[str], Dict[str, Any], List[ToolCall], List[Future]]:
+        """
+        Run one model turn with streaming, dispatching tool calls early.
+        
+        Tool calls stream one after another, so a call's arguments are
+        complete as soon as the next call starts; it is submitted to the
+        tool pool right then instead of after the whole completion. Each
+        worker gets a copy of the context so tool traces stay nested under
+        this query's LangSmith run.
+        
+        Returns:
+            Tuple of (text content or None, assistant message to append,
+            decoded tool calls, their result futures in call order)
+        """
+        stream = self.client.chat.completions.create(
+            **self._completion_params(messages, cache_key), stream=True
+        )
+        
+        text_parts: List[str] = []
+        raw_calls: List[Dict[str, Any]] = []
+        argument_parts: List[List[str]] = []
+        calls: List[ToolCall] = []
+        futures: List[Future] = []
+        
+        def dispatch(index: int):
+            raw = raw_calls[index]
+            raw["function"]["arguments"] = "".join(argument_parts[index])
+            call = ToolCall(raw["id"], raw["function"]["name"], orjson.loads(raw["function"]["arguments"]))
+            logger.debug("Agent calling tool: {}({})", call.name, call.args)
+            tools_used.append(call.name)
+            calls.append(call)
+            futures.append(self._executor.submit(
+                contextvars.copy_context().run, self._execute_tool, call.name, call.args
+            ))
+        
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                text_parts.append(delta.content)
+            for tool_call in delta.tool_calls or []:
+                if tool_call.index == len(raw_calls):
+                    # A new call starts, so the previous one is complete
+                    if raw_calls:
+                        dispatch(len(raw_calls) - 1)
+                    raw_calls.append({
+                        "id": tool_call.id,
+                        "type": "function",
+                        "function": {"name": tool_call.function.name, "arguments": ""}
                     })
-                
-            except Exception as e:
-                logger.error(f"Agent error on iteration {iteration}: {e}")
-                return {
-                    "type": "error",
-                    "content": f"Agent error: {str(e)}",
-                    "tools_used": tools_used,
-                    "metadata": {
-                        "error": str(e),
-                        "iteration": iteration,
-                        "query": query
+                    argument_parts.append([])
+                if tool_call.function and tool_call.function.arguments:
+                    argument_parts[tool_call.index].append(tool_call.function.arguments)
+        
+        if raw_calls:
+            dispatch(len(raw_calls) - 1)
+        
+        content = "".join(text_parts) or None
+        assistant_message = {"role": "assistant", "content": content, "tool_calls": raw_calls}
+        return content, assistant_message, calls, futures
+
+    @staticmethod
+    def _assistant_message(message) -> Dict[str, Any]:
+        """Assistant message (with its tool calls) to append to the conversation."""
+        return {
+            "role": "assistant",
+            "content": message.content,
+            "tool_calls": [
+                {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {
+                        "name": tc.function.name,
+                        "arguments": tc.function.arguments
                     }
                 }
+                for tc in message.tool_calls
+            ]
+        }
+
+    @staticmethod
+    def _tool_messages(
+        calls: List[ToolCall],
+        results: List[Dict[str, Any]],
+        tool_results: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Record tool results and build the matching tool-role messages.
+        
+        Returns:
+            Tool messages, in tool call order
+        """
+        tool_call_results = []
+        for call, result in zip(calls, results):
+            tool_results[call.name] = result
+            
+            # Add tool result to conversation
+            tool_call_results.append({
+                "role": "tool",
+                "tool_call_id": call.id,
+                "content": orjson.dumps(result).decode()
+            })
+            
+            logger.debug("Tool {} result: {}", call.name, result.get('type'))
+        return tool_call_results
+
+    def _success_result(
+        self,
+        content: Optional[str],
+        query: str,
+        iteration: int,
+        tools_used: List[str],
+        tool_results: Dict[str, Any],
+        memory: Optional[FactMemory],
+        direct_tool_answer: bool = False
+    ) -> Dict[str, Any]:
+        """Build the final success response (and queue fact extraction)."""
+        if direct_tool_answer:
+            logger.success("Agent completed in {} iterations (direct tool answer)", iteration)
+        else:
+            logger.success("Agent completed in {} iterations", iteration)
+        self._remember(memory, query, content)
+        
+        metadata = {
+            "iterations": iteration,
+            "model": self.model,
+            "query": query
+        }
+        if direct_tool_answer:
+            metadata["direct_tool_answer"] = True
         
-        # Max iterations reached
-        logger.warning(f"Agent reached max iterations ({max_iterations})")
         return {
-            "type": "partial",
-            "content": "I needed to make too many tool calls. Please try rephrasing your query.",
+            "type": "success",
+            "content": content,
             "tools_used": tools_used,
             "tool_results": tool_results,
+            "metadata": metadata
+        }
+
+    @staticmethod
+    def _error_result(error: Exception, query: str, iteration: int, tools_used: List[str]) -> Dict[str, Any]:
+        """Build the response for a failed agent iteration."""
+        logger.error(f"Agent error on iteration {iteration}: {error}")
+        return {
+            "type": "error",
+            "content": f"Agent error: {str(error)}",
+            "tools_used": tools_used,
             "metadata": {
-                "iterations": max_iterations,
-                "reason": "max_iterations_reached",
+                "error": str(error),
+                "iteration": iteration,
                 "query": query
             }
         }
 
+    def _cached_response(
+        self,
+        query: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+        conversation_id: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response for a standalone query.
+        
+        Follow-ups are never served from cache: their answer depends on the
+        conversation, not just the query text. A hit still counts as a turn
+        of this conversation, so it is recorded in fact memory.
+        
+        Returns:
+            Copy of the cached response marked cached, or None on a miss
+            (or for follow-ups)
+        """
+        if conversation_history:
+            return None
+        
+        key = self._query_key(query)
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is None:
+                return None
+            created_at, result = entry
+            if time.monotonic() - created_at > RESPONSE_CACHE_TTL:
+                del self._response_cache[key]
+                return None
+            self._response_cache.move_to_end(key)
+        
+        logger.debug("Response cache hit: '{}'", query)
+        _, memory = self._conversation_state(query, conversation_history, conversation_id)
+        self._remember(memory, query, result.get("content"))
+        
+        # Callers may mutate the response; keep the cached entry intact
+        return {**result, "metadata": {**result["metadata"], "cached": True}}
+
+    def _cache_response(
+        self,
+        query: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+        result: Dict[str, Any]
+    ):
+        """Cache a successful response to a standalone query (LRU + TTL)."""
+        if conversation_history or result.get("type") != "success":
+            return
+        
+        key = self._query_key(query)
+        with self._response_cache_lock:
+            self._response_cache[key] = (time.monotonic(), result)
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+    def _route_circuit_query(self, query: str, memory: Optional[FactMemory]) -> Optional[Dict[str, Any]]:
+        """
+        Answer a plain circuit request straight from the circuit tool.
+        
+        Returns:
+            Final response, or None if the query isn't a plain circuit
+            request or the circuit tool can't resolve it
+        """
+        match = _CIRCUIT_QUERY_PATTERN.match(query)
+        if match is None:
+            return None
+        
+        tool_results = {
+            "get_circuit_image": self._execute_tool("get_circuit_image", {"location": match.group("location")})
+        }
+        direct_answer = self._direct_answer(1, tool_results)
+        if direct_answer is None:
+            return None
+        
+        response = self._success_result(
+            direct_answer, query, 0, ["get_circuit_image"], tool_results, memory,
+            direct_tool_answer=True
+        )
+        response["metadata"]["route"] = "pattern"
+        return response
+
+    def _route_directly(
+        self,
+        query: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+        memory: Optional[FactMemory]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Answer a query without any LLM turn when its route is unambiguous.
+        
+        Plain circuit requests are matched by pattern. Regulations queries
+        are routed only with the embedding router and for standalone
+        queries: follow-ups need the LLM to resolve references to earlier
+        turns.
+        
+        Returns:
+            Final response, or None to use the normal tool-calling path
+        """
+        routed = self._route_circuit_query(query, memory)
+        if routed is not None:
+            return routed
+        
+        if self._router is None or conversation_history:
+            return None
+        
+        try:
+            route = self._router.route(query)
+        except Exception as e:
+            logger.warning(f"Router failed, falling back to LLM routing: {e}")
+            return None
+        
+        if route != "regulations":
+            return None
+        
+        tools_used = ["query_regulations"]
+        tool_results = {"query_regulations": self._execute_tool("query_regulations", {"question": query})}
+        
+        direct_answer = self._direct_answer(1, tool_results)
+        if direct_answer is None:
+            return None
+        
+        result = self._success_result(
+            direct_answer, query, 0, tools_used, tool_results, memory,
+            direct_tool_answer=True
+        )
+        result["metadata"]["route"] = "embedding"
+        return result
+
+    @traceable(name="Orchestrator-process_query", tags=["agent", "orchestrator", "tool-calling"])
+    def process_query(
+        self, 
+        query: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        conversation_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Process user query using Orchestrator agent with tool calling.
+        
+        Agent decides which tools to call based on query understanding.
+        Supports conversation memory for follow-up questions.
+        
+        Args:
+            query: User's F1 information query
+            conversation_history: Previous conversation messages for context
+            Format: [{"role": "user", "content": "..."}, 
+                    {"role": "assistant", "content": "..."}, ...]
+            Typically provided by Streamlit session state
+            conversation_id: Prompt cache key for this conversation
+                (default: derived from its first user message)
+            
+        Returns:
+            Dict with response, tools_used, and metadata
+        """
+        logger.info("Processing query: '{}'", query)
+        
+        cached = self._cached_response(query, conversation_history, conversation_id)
+        if cached is not None:
+            return cached
+        
+        result = self._run_query(query, conversation_history, conversation_id)
+        self._cache_response(query, conversation_history, result)
+        return result
+
+    def _run_query(
+        self,
+        query: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+        conversation_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Run the tool-calling loop for process_query (no response cache)."""
+        cache_key, memory = self._conversation_state(query, conversation_history, conversation_id)
+        
+        routed = self._route_directly(query, conversation_history, memory)
+        if routed is not None:
+            return routed
+        
+        messages = self._prepare_messages(query, conversation_history, memory)
+        
+        tools_used = []
+        tool_results = {}
+        iteration = 1  # 1: tool routing, 2: final response
+        
+        try:
+            # Call model with tools; tools start while the turn streams
+            content, assistant_message, calls, futures = self._stream_turn(
+                messages, cache_key, tools_used
+            )
+            
+            # Check if agent wants to call tools
+            if not calls:
+                # Agent provided final answer
+                return self._success_result(
+                    content, query, iteration, tools_used, tool_results, memory
+                )
+            
+            # Add assistant message to conversation
+            messages.append(assistant_message)
+            
+            # Combined queries run both tools at once: max(t1, t2) instead of t1 + t2
+            results = [future.result() for future in futures]
+            
+            tool_call_results = self._tool_messages(calls, results, tool_results)
+            
+            # Single-tool fast path: answer straight from the tool result
+            direct_answer = self._direct_answer(len(calls), tool_results)
+            if direct_answer is not None:
+                return self._success_result(
+                    direct_answer, query, iteration, tools_used, tool_results, memory,
+                    direct_tool_answer=True
+                )
+            
+            # Add all tool results at once (more efficient)
+            messages.extend(tool_call_results)
+            
+            # Final response, with tool calls disabled
+            iteration = 2
+            response = self.client.chat.completions.create(
+                **self._completion_params(messages, cache_key, final=True)
+            )
+            return self._success_result(
+                response.choices[0].message.content, query, iteration, tools_used, tool_results, memory
+            )
+            
+        except Exception as e:
+            return self._error_result(e, query, iteration, tools_used)
+
+    @traceable(name="Orchestrator-aprocess_query", tags=["agent", "orchestrator", "tool-calling"])
+    async def aprocess_query(
+        self,
+        query: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        conversation_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Async version of process_query for event-loop servers.
+        
+        OpenAI calls go through AsyncOpenAI and tools run in worker threads,
+        so the event loop stays free during every network wait and one
+        worker can serve many queries concurrently.
+        
+        Args:
+            query: User's F1 information query
+            conversation_history: Previous conversation messages for context
+            conversation_id: Prompt cache key for this conversation
+            
+        Returns:
+            Dict with response, tools_used, and metadata (same as process_query)
+        """
+        logger.info("Processing query (async): '{}'", query)
+        
+        cached = self._cached_response(query, conversation_history, conversation_id)
+        if cached is not None:
+            return cached
+        
+        result = await self._arun_query(query, conversation_history, conversation_id)
+        self._cache_response(query, conversation_history, result)
+        return result
+
+    async def _arun_query(
+        self,
+        query: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+        conversation_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Run the tool-calling loop for aprocess_query (no response cache)."""
+        cache_key, memory = self._conversation_state(query, conversation_history, conversation_id)
+        
+        routed = await asyncio.to_thread(self._route_directly, query, conversation_history, memory)
+        if routed is not None:
+            return routed
+        
+        # May call the summary / embedding APIs synchronously
+        messages = await asyncio.to_thread(self._prepare_messages, query, conversation_history, memory)
+        
+        tools_used = []
+        tool_results = {}
+        iteration = 1  # 1: tool routing, 2: final response
+        
+        try:
+            response = await self.async_client.chat.completions.create(
+                **self._completion_params(messages, cache_key)
+            )
+            
+            message = response.choices[0].message
+            
+            if not message.tool_calls:
+                return self._success_result(
+                    message.content, query, iteration, tools_used, tool_results, memory
+                )
+            
+            messages.append(self._assistant_message(message))
+            
+            # Tools are blocking clients; run them concurrently off the loop
+            calls = self._parse_tool_calls(message, tools_used)
+            results = await asyncio.gather(*[
+                asyncio.to_thread(self._execute_tool, call.name, call.args)
+                for call in calls
+            ])
+            
+            tool_call_results = self._tool_messages(calls, results, tool_results)
+            
+            direct_answer = self._direct_answer(len(calls), tool_results)
+            if direct_answer is not None:
+                return self._success_result(
+                    direct_answer, query, iteration, tools_used, tool_results, memory,
+                    direct_tool_answer=True
+                )
+            
+            messages.extend(tool_call_results)
+            
+            # Final response, with tool calls disabled
+            iteration = 2
+            response = await self.async_client.chat.completions.create(
+                **self._completion_params(messages, cache_key, final=True)
+            )
+            return self._success_result(
+                response.choices[0].message.content, query, iteration, tools_used, tool_results, memory
+            )
+            
+        except Exception as e:
+            return self._error_result(e, query, iteration, tools_used)
+
+    async def astream_query(
+        self,
+        query: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        conversation_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a query, yielding partial results as soon as they exist.
+        
+        Each tool result is yielded as its tool finishes (a circuit image is
+        available long before a regulations answer), and the final answer is
+        streamed token by token.
+        
+        Args:
+            query: User's F1 information query
+            conversation_history: Previous conversation messages for context
+            conversation_id: Prompt cache key for this conversation
+            
+        Yields:
+            Events, in order:
+            - {"event": "tool_result", "tool": name, "result": tool result}
+            - {"event": "text", "content": answer text chunk}
+            - {"event": "done", "result": same dict process_query returns}
+        """
+        logger.info("Streaming query: '{}'", query)
+        
+        cache_key, memory = self._conversation_state(query, conversation_history, conversation_id)
+        
+        routed = await asyncio.to_thread(self._route_directly, query, conversation_history, memory)
+        if routed is not None:
+            for tool_name, result in routed["tool_results"].items():
+                yield {"event": "tool_result", "tool": tool_name, "result": result}
+            yield {"event": "text", "content": routed["content"]}
+            yield {"event": "done", "result": routed}
+            return
+        
+        messages = await asyncio.to_thread(self._prepare_messages, query, conversation_history, memory)
+        
+        tools_used = []
+        tool_results = {}
+        iteration = 1
+        
+        try:
+            response = await self.async_client.chat.completions.create(
+                **self._completion_params(messages, cache_key)
+            )
+            message = response.choices[0].message
+            
+            if not message.tool_calls:
+                yield {"event": "text", "content": message.content or ""}
+                yield {"event": "done", "result": self._success_result(
+                    message.content, query, iteration, tools_used, tool_results, memory
+                )}
+                return
+            
+            messages.append(self._assistant_message(message))
+            calls = self._parse_tool_calls(message, tools_used)
+            
+            async def run(call: ToolCall):
+                return call, await asyncio.to_thread(self._execute_tool, call.name, call.args)
+            
+            # Yield each tool result as soon as its tool finishes
+            results_by_id = {}
+            for next_done in asyncio.as_completed([run(call) for call in calls]):
+                call, result = await next_done
+                results_by_id[call.id] = result
+                yield {"event": "tool_result", "tool": call.name, "result": result}
+            
+            tool_call_results = self._tool_messages(
+                calls, [results_by_id[call.id] for call in calls], tool_results
+            )
+            
+            direct_answer = self._direct_answer(len(calls), tool_results)
+            if direct_answer is not None:
+                yield {"event": "text", "content": direct_answer}
+                yield {"event": "done", "result": self._success_result(
+                    direct_answer, query, iteration, tools_used, tool_results, memory,
+                    direct_tool_answer=True
+                )}
+                return
+            
+            messages.extend(tool_call_results)
+            
+            # Final answer (tool calls disabled), streamed
+            iteration = 2
+            stream = await self.async_client.chat.completions.create(
+                **self._completion_params(messages, cache_key, final=True), stream=True
+            )
+            
+            text_parts = []
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    text_parts.append(delta.content)
+                    yield {"event": "text", "content": delta.content}
+            
+            yield {"event": "done", "result": self._success_result(
+                "".join(text_parts), query, iteration, tools_used, tool_results, memory
+            )}
+            
+        except Exception as e:
+            yield {"event": "done", "result": self._error_result(e, query, iteration, tools_used)}
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the background event loop used by stream_query, starting it once."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="agent-loop", daemon=True).start()
+            return self._loop
+
+    def stream_query(
+        self,
+        query: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        conversation_id: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Synchronous astream_query, for callers without an event loop (e.g. Streamlit).
+        
+        The async generator runs on the orchestrator's background loop; each
+        event is handed back to the calling thread as soon as it exists.
+        
+        Args:
+            query: User's F1 information query
+            conversation_history: Previous conversation messages for context
+            conversation_id: Prompt cache key for this conversation
+            
+        Yields:
+            Same events as astream_query
+        """
+        loop = self._event_loop()
+        events = self.astream_query(query, conversation_history, conversation_id)
+        
+        try:
+            while True:
+                try:
+                    yield asyncio.run_coroutine_threadsafe(events.__anext__(), loop).result()
+                except StopAsyncIteration:
+                    return
+        finally:
+            asyncio.run_coroutine_threadsafe(events.aclose(), loop).result()
+
+    def _direct_answer(self, num_calls: int, tool_results: Dict[str, Any]) -> Optional[str]:
+        """
+        Return a final answer taken directly from tool results, if possible.
+        
+        A lone successful query_regulations call already carries a
+        Bedrock-generated answer, and a lone circuit image only needs a
+        caption, so a second LLM turn to restate either is skipped.
+        
+        Args:
+            num_calls: Tool calls made this turn. tool_results is keyed by
+                tool name, so parallel calls to the same tool (two questions,
+                two circuits) share one entry; they need the LLM to combine
+            tool_results: Results of the tools called so far, by name
+            
+        Returns:
+            Answer text, or None if the LLM should summarize the results
+        """
+        if num_calls != 1 or len(tool_results) != 1:
+            return None
+        
+        result = tool_results.get("query_regulations")
+        if result and result.get("type") == "text" and result.get("content"):
+            return result["content"]
+        
+        # Captions a single map only: "Monaco and Silverstone" makes two
+        # calls, and the LLM turn names both circuits
+        result = tool_results.get("get_circuit_image")
+        if result and result.get("type") == "image":
+            return _CIRCUIT_ANSWER.format(result["metadata"]["normalized"].replace("_", " "))
+        
+        return None
+
+    @staticmethod
+    def _query_key(question: str) -> bytes:
+        """
+        Cache key for a standalone query.
+        
+        Case, punctuation and whitespace are normalized away, so
+        "How many points for 1st?" and "how many points for 1st" share a key.
+        """
+        normalized = " ".join(question.lower().translate(_PUNCTUATION_TABLE).split())
+        return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
     @traceable(name="execute_tool", tags=["tool-execution"])
     def _execute_tool(self, tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -327,23 +1257,24 @@ class Orchestrator:
         Returns:
             Tool execution result
         """
-        logger.debug(f"Executing tool: {tool_name}")  # Changed to debug for less overhead
+        logger.debug("Executing tool: {}", tool_name)
         
         try:
             if tool_name == "get_circuit_image":
                 location = args.get("location", "")
                 result = self.circuit_tool.get_circuit_image(location)
-                # Only log if error for speed
+                # Only log errors: this runs on every circuit query
                 if result.get('type') == 'error':
-                    logger.warning(f"Circuit tool error: {result.get('metadata', {}).get('status')}")
+                    logger.warning("Circuit tool error: {}", result.get('metadata', {}).get('status'))
                 return result
                 
             elif tool_name == "query_regulations":
                 question = args.get("question", "")
+                # Repeated and paraphrased questions are cached by the tool
                 result = self.regulations_tool.query_regulations(question)
                 # Only log if error for speed
                 if result.get('type') == 'error':
-                    logger.warning(f"Regulations tool error: {result.get('metadata', {}).get('status')}")
+                    logger.warning("Regulations tool error: {}", result.get('metadata', {}).get('status'))
                 return result
                 
             else:
@@ -363,15 +1294,20 @@ class Orchestrator:
             }
 
 
-# Singleton instance
-_orchestrator_instance: Optional[Orchestrator] = None
+# Singleton instances, one per model
+_orchestrator_instances: Dict[str, Orchestrator] = {}
 
 
-def get_orchestrator() -> Orchestrator:
-    """Get or create singleton instance of Orchestrator."""
-    global _orchestrator_instance
+def get_orchestrator(model: Optional[str] = None) -> Orchestrator:
+    """
+    Get or create singleton instance of Orchestrator for a model.
+    
+    Args:
+        model: OpenAI model name (default: settings.openai_model)
+    """
+    model = model or settings.openai_model
     
-    if _orchestrator_instance is None:
-        _orchestrator_instance = Orchestrator()
+    if model not in _orchestrator_instances:
+        _orchestrator_instances[model] = Orchestrator(model=model)
     
-    return _orchestrator_instance
+    return _orchestrator_instances[model]
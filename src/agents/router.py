@@ -0,0 +1,128 @@
+"""
+Embedding-based query router.
+
+Classifies a query as circuit / regulations / both / other by cosine
+similarity to labeled example queries, using OpenAI embeddings. One
+embeddings call (~100ms) is far cheaper than an LLM routing turn, and it
+matches on meaning rather than keywords ("is COTA on the calendar?").
+"""
+
+import threading
+from typing import Dict, List, Optional
+from loguru import logger
+from openai import OpenAI
+
+from src.config.settings import settings
+
+
+# Labeled example queries; each label's centroid is the mean of its embeddings
+ROUTE_EXAMPLES: Dict[str, List[str]] = {
+    "regulations": [
+        "How many points does 1st place get?",
+        "What are the DRS rules?",
+        "When can the safety car be deployed?",
+        "What is the penalty for a false start?",
+        "How many power units can a driver use per season?",
+        "What is the cost cap in the financial regulations?",
+        "What is the pit lane speed limit?",
+        "What are the parc ferme rules after qualifying?",
+    ],
+    "circuit": [
+        "Show me the Monaco circuit",
+        "Display the Las Vegas track map",
+        "What does Silverstone look like?",
+        "Circuit map for Suzuka",
+        "Show COTA",
+        "Can I see the Spa layout?",
+    ],
+    "both": [
+        "Show me Monza and explain the DRS rules",
+        "Display the Baku circuit and tell me the safety car procedure",
+        "Show Singapore and what is the pit lane speed limit there?",
+    ],
+    "other": [
+        "Hello",
+        "Thanks!",
+        "What can you do?",
+        "Who won the last race?",
+    ],
+}
+
+
+class EmbeddingRouter:
+    """
+    Nearest-centroid classifier over OpenAI embeddings.
+
+    Only confident decisions are returned: the best label must score at
+    least min_score and beat the runner-up by min_margin. Anything else is
+    left to the LLM.
+    """
+
+    def __init__(self, client: OpenAI, min_score: float = 0.4, min_margin: float = 0.05):
+        """
+        Initialize router; example embeddings are computed on first use.
+
+        Args:
+            client: OpenAI client used for embeddings
+            min_score: Minimum cosine similarity to the winning centroid
+            min_margin: Minimum lead over the second-best label
+        """
+        self.client = client
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self._centroids: Optional[Dict[str, List[float]]] = None
+        self._lock = threading.Lock()
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in a single API call."""
+        response = self.client.embeddings.create(
+            model=settings.openai_embedding_model,
+            input=texts
+        )
+        return [item.embedding for item in response.data]
+
+    def _get_centroids(self) -> Dict[str, List[float]]:
+        """Compute unit-length label centroids once (one embeddings call)."""
+        with self._lock:
+            if self._centroids is None:
+                labels = [label for label, examples in ROUTE_EXAMPLES.items() for _ in examples]
+                vectors = self._embed([text for examples in ROUTE_EXAMPLES.values() for text in examples])
+
+                centroids = {}
+                for label in ROUTE_EXAMPLES:
+                    members = [vector for vector_label, vector in zip(labels, vectors) if vector_label == label]
+                    mean = [sum(values) / len(members) for values in zip(*members)]
+                    norm = sum(value * value for value in mean) ** 0.5
+                    centroids[label] = [value / norm for value in mean]
+
+                self._centroids = centroids
+                logger.debug("Router centroids ready ({} labels)", len(centroids))
+
+            return self._centroids
+
+    def route(self, query: str) -> Optional[str]:
+        """
+        Classify a query.
+
+        Args:
+            query: User's F1 information query
+
+        Returns:
+            "circuit", "regulations", "both" or "other", or None if not confident
+        """
+        centroids = self._get_centroids()
+        query_vector = self._embed([query])[0]
+
+        scores = sorted(
+            (
+                (sum(q * c for q, c in zip(query_vector, centroid)), label)
+                for label, centroid in centroids.items()
+            ),
+            reverse=True
+        )
+        (best_score, best_label), (second_score, _) = scores[0], scores[1]
+        logger.debug("Route scores for '{}': {}", query, scores)
+
+        if best_score < self.min_score or best_score - second_score < self.min_margin:
+            return None
+        return best_label
@@ -11,6 +11,15 @@ class Settings:
     # OpenAI
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     openai_model: str = os.getenv("OPENAI_MODEL", "gpt-4o")
+    openai_summary_model: str = os.getenv("OPENAI_SUMMARY_MODEL", "gpt-4o-mini")
+    openai_embedding_model: str = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+    
+    # Agent memory: "history" (recent messages + summary) or "facts" (extracted facts)
+    agent_memory: str = os.getenv("AGENT_MEMORY", "history")
+    
+    # Agent routing: "llm" (tool calling decides) or "embedding" (confident
+    # regulations queries skip the LLM routing turn)
+    agent_router: str = os.getenv("AGENT_ROUTER", "llm")
     
     # AWS Bedrock
     aws_access_key_id: str = os.getenv("AWS_ACCESS_KEY_ID", "")
@@ -19,6 +28,12 @@ class Settings:
     bedrock_kb_id: str = os.getenv("BEDROCK_KNOWLEDGE_BASE_ID", "")
     bedrock_embedding_model: str = os.getenv("BEDROCK_EMBEDDING_MODEL", "amazon.titan-embed-text-v2:0")
     bedrock_generation_model: str = os.getenv("BEDROCK_GENERATION_MODEL", "anthropic.claude-3-sonnet-20240229-v1:0")
+    # Latency-optimized inference for RAG generation (supported models only)
+    bedrock_latency_optimized: bool = os.getenv("BEDROCK_LATENCY_OPTIMIZED", "true").lower() == "true"
+    
+    # LangSmith: share of top-level regulations queries traced (calls inside a
+    # traced agent run are always traced, so trees stay complete)
+    langsmith_sample_rate: float = float(os.getenv("LANGSMITH_SAMPLE_RATE", "0.1"))
     
     # Pinecone
     pinecone_api_key: str = os.getenv("PINECONE_API_KEY", "")
@@ -5,6 +5,8 @@ GPT-4o understands location queries naturally.
 Uses LangSmith for tracing.
 """
 
+import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 from loguru import logger
@@ -28,6 +30,12 @@ class CircuitRetrieval:
         "Spain", "USA"
     ]
 
+    # Image file name = circuit name + suffix (e.g. Monaco_Circuit.webp)
+    IMAGE_SUFFIX = "_Circuit.webp"
+
+    # Not-found message template; the circuit list is joined once, not per miss
+    NOT_FOUND_MESSAGE = "Circuit '{location}' not found. Available circuits: " + ", ".join(CIRCUIT_LOCATIONS)
+
     def __init__(self, circuit_maps_dir: str = "f1_2025_circuit_maps"):
         """
         Initialize circuit retrieval tool.
@@ -35,6 +43,37 @@ class CircuitRetrieval:
         Args:
             circuit_maps_dir: Path to directory containing circuit images
         """
+        # (official name, lowercased display name) pairs, computed once
+        self._circuit_locations_lc = tuple(
+            (circuit_name, circuit_name.lower().replace('_', ' '))
+            for circuit_name in self.CIRCUIT_LOCATIONS
+        )
+        
+        # Name parts (>3 chars) -> circuit, matched with one compiled regex scan
+        # (handles "Vegas" -> "Las_Vegas")
+        self._circuit_by_part = {
+            part: circuit_name
+            for circuit_name in self.CIRCUIT_LOCATIONS
+            for part in circuit_name.lower().split('_')
+            if len(part) > 3
+        }
+        self._circuit_parts = frozenset(self._circuit_by_part)
+        self._part_pattern = re.compile(
+            "|".join(re.escape(part) for part in sorted(self._circuit_by_part, key=len, reverse=True))
+        )
+        
+        # Known spellings (official, spaced, and name parts) -> circuit,
+        # resolved once with the full scan so a hit is a single dict lookup
+        self._location_lookup = {
+            key: self._scan_location(key)
+            for circuit_name, circuit_lower in self._circuit_locations_lc
+            for key in (circuit_name.lower(), circuit_lower, *circuit_lower.split())
+        }
+        
+        # Normalization is pure over the input string, and users repeat the
+        # same few locations, so memoize it per instance
+        self._normalize_location = lru_cache(maxsize=256)(self._normalize_location)
+        
         # Get absolute path from project root
         base_dir = Path(__file__).parent.parent.parent
         self.circuit_maps_dir = base_dir / circuit_maps_dir
@@ -43,6 +82,20 @@ class CircuitRetrieval:
             logger.warning(f"Circuit maps directory not found: {self.circuit_maps_dir}")
         else:
             logger.success(f"Circuit maps directory: {self.circuit_maps_dir}")
+        
+        # Circuit name -> absolute image path and image bytes, from one scan
+        # of the directory (24 small .webp files, ~1MB): lookups never stat
+        # or read the disk
+        image_files = {
+            path.name[:-len(self.IMAGE_SUFFIX)]: path
+            for path in self.circuit_maps_dir.glob(f"*{self.IMAGE_SUFFIX}")
+        }
+        self._image_paths: Dict[str, str] = {
+            name: str(path.absolute()) for name, path in image_files.items()
+        }
+        self._image_bytes: Dict[str, bytes] = {
+            name: path.read_bytes() for name, path in image_files.items()
+        }
 
     @traceable(name="get_circuit_image", tags=["circuit", "retrieval"])
     def get_circuit_image(self, location: str) -> Dict[str, Any]:
@@ -58,19 +111,16 @@ class CircuitRetrieval:
         Returns:
             Dict with type, content (path), and metadata
         """
-        logger.info(f"Retrieving circuit image for: '{location}'")
+        logger.debug("Retrieving circuit image for: '{}'", location)
         
         # Normalize location name to match file convention
         normalized = self._normalize_location(location)
         
         if not normalized:
-            logger.warning(f"Location not found: '{location}'")
+            logger.warning("Location not found: '{}'", location)
             return {
                 "type": "error",
-                "content": (
-                    f"Circuit '{location}' not found. "
-                    f"Available circuits: {', '.join(self.CIRCUIT_LOCATIONS)}"
-                ),
+                "content": self.NOT_FOUND_MESSAGE.format(location=location),
                 "metadata": {
                     "location": location,
                     "status": "not_found",
@@ -78,12 +128,12 @@ class CircuitRetrieval:
                 }
             }
         
-        # Build image path
-        image_filename = f"{normalized}_Circuit.webp"
-        image_path = self.circuit_maps_dir / image_filename
+        # Look up the image (scanned at init, so no filesystem access)
+        image_filename = f"{normalized}{self.IMAGE_SUFFIX}"
+        image_path = self._image_paths.get(normalized)
         
-        if not image_path.exists():
-            logger.error(f"Circuit image file not found: {image_path}")
+        if image_path is None:
+            logger.error(f"Circuit image file not found: {self.circuit_maps_dir / image_filename}")
             return {
                 "type": "error",
                 "content": f"Found circuit '{normalized}' but image file is missing.",
@@ -95,11 +145,11 @@ class CircuitRetrieval:
                 }
             }
         
-        logger.success(f"Circuit image found: {normalized} -> {image_filename}")
+        logger.debug("Circuit image found: {} -> {}", normalized, image_filename)
         
         return {
             "type": "image",
-            "content": str(image_path.absolute()),
+            "content": image_path,
             "metadata": {
                 "location": location,
                 "normalized": normalized,
@@ -124,29 +174,68 @@ class CircuitRetrieval:
         """
         location_lower = location.lower().strip()
         
-        # Direct match against official names
-        for circuit_name in self.CIRCUIT_LOCATIONS:
-            circuit_lower = circuit_name.lower().replace('_', ' ')
+        if location_lower in self._location_lookup:
+            circuit_name = self._location_lookup[location_lower]
+            logger.debug("Lookup match: '{}' -> '{}'", location, circuit_name)
+            return circuit_name
+        
+        circuit_name = self._scan_location(location_lower)
+        if circuit_name is None:
+            logger.warning("No match found for: '{}'", location)
+        return circuit_name
+
+    def _scan_location(self, location_lower: str) -> Optional[str]:
+        """
+        Match a lowercased location against every official name.
+        
+        Args:
+            location_lower: Lowercased, stripped location string
             
+        Returns:
+            First matching circuit name (in CIRCUIT_LOCATIONS order) or None
+        """
+        # Circuits with a name part in the location. When every word is a
+        # name part, those words are exactly what the substring scan would
+        # find; otherwise (e.g. "lasvegas", "australian monaco") run the scan
+        # so every circuit it finds competes in CIRCUIT_LOCATIONS order
+        words = set(location_lower.replace('_', ' ').split())
+        if words <= self._circuit_parts:
+            parts_found = words
+        else:
+            parts_found = {match.group() for match in self._part_pattern.finditer(location_lower)}
+        part_matches = {self._circuit_by_part[part] for part in parts_found}
+        
+        # Direct match against official names
+        for circuit_name, circuit_lower in self._circuit_locations_lc:
             # Exact match
             if location_lower == circuit_lower:
-                logger.debug(f"Exact match: '{location}' -> '{circuit_name}'")
+                logger.debug("Exact match: '{}' -> '{}'", location_lower, circuit_name)
                 return circuit_name
             
             # Location is contained in circuit name
             if location_lower in circuit_lower:
-                logger.debug(f"Partial match: '{location}' -> '{circuit_name}'")
+                logger.debug("Partial match: '{}' -> '{}'", location_lower, circuit_name)
                 return circuit_name
             
             # Circuit name parts in location (handles "Vegas" -> "Las_Vegas")
-            circuit_parts = circuit_lower.split()
-            if any(part in location_lower for part in circuit_parts if len(part) > 3):
-                logger.debug(f"Part match: '{location}' -> '{circuit_name}'")
+            if circuit_name in part_matches:
+                logger.debug("Part match: '{}' -> '{}'", location_lower, circuit_name)
                 return circuit_name
         
-        logger.warning(f"No match found for: '{location}'")
         return None
 
+    def get_image_bytes(self, circuit_name: str) -> Optional[bytes]:
+        """
+        Return the preloaded image for a circuit.
+        
+        Args:
+            circuit_name: Normalized circuit name (e.g., "Las_Vegas")
+            
+        Returns:
+            Image file contents, or None if there is no image for it
+        """
+        return self._image_bytes.get(circuit_name)
+
     def list_available_circuits(self) -> list:
         """Return list of all available circuit locations."""
         return self.CIRCUIT_LOCATIONS.copy()
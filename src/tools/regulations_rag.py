@@ -1,4 +1,3 @@
-
 """
 F1 Regulations RAG tool.
 
@@ -10,19 +9,301 @@ Architecture Decision (see docs/ACCURACY_COMPARISON.md):
 - Bedrock Retrieve + GPT-4o: 7.2s avg, better formatting, worse retrieval
 - Decision: Use RetrieveAndGenerate (retrieval quality > formatting)
 
-All operations traced with LangSmith for observability.
+Answers are cached in-process (exact match first, then semantic), so
+repeated and paraphrased questions skip the Bedrock call.
+
+Queries are traced with LangSmith: always inside a traced agent run,
+otherwise sampled (LANGSMITH_SAMPLE_RATE) to keep tracing off the hot path.
 """
 
-import boto3
+import asyncio
+import contextvars
+import hashlib
+import random
+import re
+import threading
 import time
-from typing import Dict, Any, Optional
-from botocore.exceptions import ClientError
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from langsmith import traceable
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial, wraps
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception
+from langsmith import get_current_run_tree, traceable
 from loguru import logger
+from openai import OpenAI
 
 from src.config.settings import settings
 
+__all__ = ["RegulationsRAG", "get_regulations_rag"]
+
+
+# Bedrock client: a pool large enough for concurrent agents, TCP keepalive
+# so calls reuse warm connections, and no botocore retries (tenacity retries
+# the calls via _bedrock_retry; both together would compound).
+# boto3/botocore are imported when the tool is created, not with this
+# module: they take ~200ms to import and most callers only need the class
+BEDROCK_CLIENT_CONFIG: Dict[str, Any] = {
+    'max_pool_connections': 64,
+    'tcp_keepalive': True,
+    'connect_timeout': 3,
+    'read_timeout': 30,
+    'retries': {'total_max_attempts': 1, 'mode': 'standard'}
+}
+
+# Workers for concurrent questions (aquery_regulations, query_regulations_batch).
+# The tool has its own pool: asyncio's default executor stops at
+# cpu_count() + 4 threads, which would queue a wide fan-out
+BEDROCK_WORKERS = 32
+
+# Exact-match answer cache, checked first: identical tool calls (retries, UI
+# reruns, both agents asking the same thing) return without any API call
+EXACT_CACHE_SIZE = 1024
+EXACT_CACHE_TTL = 3600
+
+# Semantic answer cache: paraphrases of an answered question ("what is DRS?",
+# "explain DRS") reuse its answer instead of another Bedrock round-trip
+SEMANTIC_CACHE_SIZE = 1024
+SEMANTIC_CACHE_TTL = 3600
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+# Reduced embedding size for the cache (text-embedding-3 models): keeps the
+# linear similarity scan over a full cache to a few milliseconds
+SEMANTIC_CACHE_DIMENSIONS = 256
+
+# The lookup embedding is on the path of every exact-cache miss: bound it
+# (no retries) so a slow embeddings call costs at most this much
+SEMANTIC_CACHE_TIMEOUT = 1.0
+
+# Numbers and ordinals in a question. Questions differing only in these
+# ("points for 1st" / "2nd", "Article 3.2" / "3.4") embed very close
+# together but have different answers, so they never share a cache entry
+_SPECIFICS_PATTERN = re.compile(
+    r"\d+(?:\.\d+)*|\b(?:first|second|third|fourth|fifth|sixth|seventh|eighth|ninth|tenth|last)\b"
+)
+
+# Generation models with Bedrock latency-optimized inference
+LATENCY_OPTIMIZED_MODELS = (
+    "claude-3-5-haiku",
+    "claude-3-7-sonnet",
+    "llama3-1-70b",
+    "llama3-1-405b",
+)
+
+# Bedrock error codes worth retrying: throttling and transient model
+# failures. Anything else (validation, access denied) fails fast
+RETRYABLE_ERROR_CODES = frozenset({
+    'ThrottlingException',
+    'ServiceQuotaExceededException',
+    'ModelTimeoutException',
+    'ModelErrorException'
+})
+
+# Read-only default for references without content (avoids a dict per lookup)
+_NO_CONTENT: Dict[str, Any] = {}
+
+
+def _is_client_error(error: BaseException) -> bool:
+    """True for botocore ClientError (botocore is loaded once a client exists)."""
+    from botocore.exceptions import ClientError
+
+    return isinstance(error, ClientError)
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """True for a ClientError with a transient Bedrock error code."""
+    return (
+        _is_client_error(error)
+        and error.response.get('Error', {}).get('Code') in RETRYABLE_ERROR_CODES
+    )
+
+
+# Bedrock calls retry transient errors (botocore's own retries are disabled)
+# with jittered exponential backoff: the 5 waits are drawn from up to 0.5s,
+# 1s, 2s, 4s and 8s, so up to ~15s of waiting over 6 attempts, long enough
+# for a throttling window to clear
+_bedrock_retry = retry(
+    stop=stop_after_attempt(6),
+    wait=wait_random_exponential(multiplier=0.5, max=8),
+    retry=retry_if_exception(_is_retryable),
+    reraise=True
+)
+
+
+def _sampled_traceable(**trace_kwargs):
+    """
+    LangSmith @traceable that only traces a sample of top-level calls.
+    
+    Calls made inside a traced run (e.g. the agent's execute_tool) are
+    always traced so the run tree stays complete; standalone calls are
+    traced with probability settings.langsmith_sample_rate, and skip the
+    tracing wrapper entirely otherwise.
+    """
+    def decorator(func):
+        traced = traceable(**trace_kwargs)(func)
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if get_current_run_tree() is not None or random.random() < settings.langsmith_sample_rate:
+                return traced(*args, **kwargs)
+            return func(*args, **kwargs)
+        
+        return wrapper
+    
+    return decorator
+
+
+def _trace_outputs(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Traced query output: the answer and a citation count instead of the full citation texts."""
+    metadata = result.get('metadata', {})
+    return {
+        'type': result.get('type'),
+        'content': result.get('content'),
+        'status': metadata.get('status'),
+        'latency_seconds': metadata.get('latency_seconds'),
+        'cache_hit': metadata.get('cache_hit', False),
+        'num_citations': len(metadata.get('citations', ()))
+    }
+
+
+@lru_cache(maxsize=32)
+def _rag_configuration(
+    kb_id: str,
+    model_arn: str,
+    latency: Optional[str],
+    num_results: int,
+    max_tokens: int,
+    temperature: float
+) -> Dict[str, Any]:
+    """
+    retrieveAndGenerateConfiguration for one set of query parameters.
+    
+    Queries almost always use the defaults, so the nested dict is built once
+    and shared by every request (botocore only reads it; do not mutate).
+    """
+    generation_configuration: Dict[str, Any] = {
+        'inferenceConfig': {
+            'textInferenceConfig': {
+                'maxTokens': max_tokens,
+                'temperature': temperature
+            }
+        }
+    }
+    if latency:
+        generation_configuration['performanceConfig'] = {'latency': latency}
+    
+    return {
+        'type': 'KNOWLEDGE_BASE',
+        'knowledgeBaseConfiguration': {
+            'knowledgeBaseId': kb_id,
+            'modelArn': model_arn,
+            'retrievalConfiguration': {
+                'vectorSearchConfiguration': {
+                    'numberOfResults': num_results
+                }
+            },
+            'generationConfiguration': generation_configuration
+        }
+    }
+
+
+def _normalize_question(question: str) -> str:
+    """
+    Canonical form of a question for the answer caches.
+    
+    Unicode form, case, whitespace and trailing punctuation are normalized
+    away, so "What is DRS?", "what is drs" and "What is DRS ?" are one
+    entry. The semantic cache embeds the same form, so both layers agree.
+    """
+    normalized = " ".join(unicodedata.normalize("NFKC", question).lower().split())
+    return normalized.rstrip(".!? ")
+
+
+def _cache_key(question: str, num_results: int, max_tokens: int, temperature: float) -> tuple:
+    """Exact-match cache key: 128-bit hash of the normalized question plus query parameters."""
+    digest = hashlib.blake2b(question.encode("utf-8"), digest_size=16).digest()
+    return (digest, num_results, max_tokens, round(temperature, 2))
+
+
+class _SemanticCache:
+    """
+    Regulations answers keyed by question embedding.
+
+    A lookup embeds the question (one ~100ms embeddings call) and returns the
+    cached answer of the most similar earlier question, if it is similar
+    enough, still fresh, was asked with the same query parameters and
+    names the same numbers and ordinals. OpenAI embeddings are unit-length, so a dot product is the cosine
+    similarity; a linear scan over at most SEMANTIC_CACHE_SIZE entries is
+    fast enough without a vector index.
+    """
+
+    def __init__(self, client: OpenAI):
+        """
+        Initialize an empty cache.
+
+        Args:
+            client: OpenAI client used for embeddings
+        """
+        self.client = client
+        # normalized question -> (params, specifics, embedding, result, stored_at); least recently used first
+        self._entries: "OrderedDict[str, Tuple[tuple, frozenset, List[float], Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed(self, question: str) -> List[float]:
+        """Embed a normalized question for lookup and insertion."""
+        response = self.client.embeddings.create(
+            model=settings.openai_embedding_model,
+            input=[question],
+            dimensions=SEMANTIC_CACHE_DIMENSIONS
+        )
+        return response.data[0].embedding
+
+    @staticmethod
+    def specifics(question: str) -> frozenset:
+        """Numbers and ordinal words in a normalized question."""
+        return frozenset(_SPECIFICS_PATTERN.findall(question))
+
+    def get(self, question: str, params: tuple, vector: List[float]) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result most similar to vector, if any qualifies.
+
+        Args:
+            question: Normalized question (its numbers/ordinals must match)
+            params: Query parameters the result must have been produced with
+            vector: Question embedding
+
+        Returns:
+            Cached result, or None on a miss
+        """
+        now = time.time()
+        specifics = self.specifics(question)
+        best_key, best_score = None, SEMANTIC_CACHE_THRESHOLD
+
+        with self._lock:
+            for key, (entry_params, entry_specifics, entry_vector, _, stored_at) in self._entries.items():
+                if (
+                    entry_params != params
+                    or entry_specifics != specifics
+                    or now - stored_at >= SEMANTIC_CACHE_TTL
+                ):
+                    continue
+                score = sum(q * v for q, v in zip(vector, entry_vector))
+                if score >= best_score:
+                    best_key, best_score = key, score
+
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key][3]
+
+    def put(self, question: str, params: tuple, vector: List[float], result: Dict[str, Any]):
+        """Store a result (least recently used entry evicted when full)."""
+        with self._lock:
+            self._entries[question] = (params, self.specifics(question), vector, result, time.time())
+            self._entries.move_to_end(question)
+            if len(self._entries) > SEMANTIC_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
 
 class RegulationsRAG:
     """
@@ -45,28 +326,202 @@ class RegulationsRAG:
         if not settings.validate():
             raise ValueError("Invalid configuration. Check environment variables.")
         
+        import boto3
+        from botocore.config import Config
+        
         # Initialize Bedrock Agent Runtime client
         self.bedrock_agent = boto3.client(
             'bedrock-agent-runtime',
             region_name=settings.aws_region,
             aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key
+            aws_secret_access_key=settings.aws_secret_access_key,
+            config=Config(**BEDROCK_CLIENT_CONFIG)
         )
         
         self.kb_id = settings.bedrock_kb_id
         self.model_arn = f"arn:aws:bedrock:{settings.aws_region}::foundation-model/{settings.bedrock_generation_model}"
         
+        # Bedrock performanceConfig latency ("optimized"), or None for standard
+        self.latency: Optional[str] = None
+        if settings.bedrock_latency_optimized:
+            if any(model in settings.bedrock_generation_model for model in LATENCY_OPTIMIZED_MODELS):
+                self.latency = 'optimized'
+            else:
+                logger.warning(
+                    f"Latency-optimized inference not available for {settings.bedrock_generation_model}; using standard"
+                )
+        
+        self._executor = ThreadPoolExecutor(max_workers=BEDROCK_WORKERS, thread_name_prefix="bedrock")
+        
+        # _cache_key(...) -> (result, stored_at), LRU + TTL
+        self._exact_cache: "OrderedDict[tuple, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._exact_cache_lock = threading.Lock()
+        
+        # Semantic answer cache (needs OpenAI embeddings; disabled without a key)
+        self._semantic_cache = _SemanticCache(
+            OpenAI(api_key=settings.openai_api_key, timeout=SEMANTIC_CACHE_TIMEOUT, max_retries=0)
+        ) if settings.openai_api_key else None
+        
         logger.success("Regulations RAG tool initialized")
         logger.info(f"  • Bedrock KB: {self.kb_id}")
         logger.info(f"  • Model: {settings.bedrock_generation_model}")
+        logger.info(f"  • Latency: {self.latency or 'standard'}")
+        logger.info(f"  • Tracing: standalone queries sampled at {settings.langsmith_sample_rate:.0%}")
 
-    @traceable(name="query_regulations", tags=["rag", "bedrock", "regulations"])
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type(ClientError),
-        reraise=True
-    )
+    @_bedrock_retry
+    def _retrieve_and_generate(self, **request) -> Dict[str, Any]:
+        """Call Bedrock RetrieveAndGenerate, retrying client errors."""
+        return self.bedrock_agent.retrieve_and_generate(**request)
+
+    @_bedrock_retry
+    def _retrieve_and_generate_stream(self, **request) -> Dict[str, Any]:
+        """Open a Bedrock RetrieveAndGenerateStream call, retrying client errors."""
+        return self.bedrock_agent.retrieve_and_generate_stream(**request)
+
+    def _request(self, question: str, num_results: int, max_tokens: int, temperature: float) -> Dict[str, Any]:
+        """Build RetrieveAndGenerate(Stream) request arguments."""
+        return {
+            'input': {
+                'text': question
+            },
+            'retrieveAndGenerateConfiguration': _rag_configuration(
+                self.kb_id, self.model_arn, self.latency, num_results, max_tokens, temperature
+            )
+        }
+
+    def _cache_lookup(self, question: str, exact_key: tuple) -> Tuple[Optional[Dict[str, Any]], Optional[List[float]]]:
+        """
+        Look a normalized question up in the exact-match, then the semantic cache.
+        
+        Returns:
+            (cached result or None, question embedding or None); the
+            embedding is reused to store the answer after a miss
+        """
+        with self._exact_cache_lock:
+            entry = self._exact_cache.get(exact_key)
+            if entry is not None:
+                if time.time() - entry[1] < EXACT_CACHE_TTL:
+                    self._exact_cache.move_to_end(exact_key)
+                else:
+                    del self._exact_cache[exact_key]
+                    entry = None
+        if entry is not None:
+            logger.info("Regulations cache hit (exact): '{}'", question)
+            return entry[0], None
+        
+        if self._semantic_cache is None:
+            return None, None
+        
+        try:
+            vector = self._semantic_cache.embed(question)
+            cached = self._semantic_cache.get(question, exact_key[1:], vector)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None, None
+        
+        if cached is not None:
+            logger.info("Regulations cache hit (semantic): '{}'", question)
+            self._store_exact(exact_key, cached)
+            return cached, None
+        
+        logger.debug("Regulations cache miss (semantic): '{}'", question)
+        return None, vector
+
+    @staticmethod
+    def _cached_result(question: str, cached: Dict[str, Any], elapsed_time: float) -> Dict[str, Any]:
+        """
+        Build the result for a cache hit.
+        
+        The cached entry is shared, so the hit gets its own copy carrying the
+        question actually asked and this lookup's latency.
+        """
+        run = get_current_run_tree()
+        if run is not None:
+            run.add_metadata({'latency_ms': int(elapsed_time * 1000), 'cache_hit': True})
+        
+        return {
+            **cached,
+            'metadata': {
+                **cached['metadata'],
+                'question': question,
+                'latency_seconds': elapsed_time,
+                'cache_hit': True
+            }
+        }
+
+    def _success_result(
+        self,
+        question: str,
+        answer: str,
+        references: Iterable[Dict[str, Any]],
+        num_results: int,
+        elapsed_time: float
+    ) -> Dict[str, Any]:
+        """Build the success result from an answer and its retrieved references."""
+        citations = [
+            {
+                'content': reference.get('content', _NO_CONTENT).get('text', ''),
+                'location': reference.get('location', {}),
+                'metadata': reference.get('metadata', {})
+            }
+            for reference in references
+        ]
+        
+        logger.debug(
+            "Regulations query completed in {:.2f}s ({} chars, {} citations)",
+            elapsed_time, len(answer), len(citations)
+        )
+        
+        # Latency as run metadata, so dashboards can filter without parsing outputs
+        run = get_current_run_tree()
+        if run is not None:
+            run.add_metadata({'latency_ms': int(elapsed_time * 1000)})
+        
+        return {
+            'type': 'text',
+            'content': answer,
+            'metadata': {
+                'status': 'success',
+                'question': question,
+                'latency_seconds': elapsed_time,
+                'citations': citations,
+                'num_results': num_results,
+                'model': settings.bedrock_generation_model
+            }
+        }
+
+    def _error_result(self, question: str, error: Exception) -> Dict[str, Any]:
+        """Build the error result for a failed query."""
+        if _is_client_error(error):
+            error_code = error.response.get('Error', {}).get('Code', 'Unknown')
+            error_msg = error.response.get('Error', {}).get('Message', str(error))
+            
+            logger.error(f"Bedrock API error: {error_code} - {error_msg}")
+            
+            return {
+                'type': 'error',
+                'content': f"Bedrock API error: {error_msg}",
+                'metadata': {
+                    'status': 'error',
+                    'error_code': error_code,
+                    'error_message': error_msg,
+                    'question': question
+                }
+            }
+        
+        logger.error(f"Unexpected error: {error}")
+        
+        return {
+            'type': 'error',
+            'content': f"Unexpected error: {str(error)}",
+            'metadata': {
+                'status': 'error',
+                'error': str(error),
+                'question': question
+            }
+        }
+
+    @_sampled_traceable(name="query_regulations", tags=["rag", "bedrock", "regulations"], process_outputs=_trace_outputs)
     def query_regulations(
         self,
         question: str,
@@ -89,98 +544,158 @@ class RegulationsRAG:
         Returns:
             Dict with type, content (answer), and metadata (citations, latency)
         """
-        logger.info(f"Querying regulations: '{question}'")
-        start_time = time.time()
+        logger.debug("Querying regulations: '{}'", question)
+        start_time = time.perf_counter()
+        
+        normalized = _normalize_question(question)
+        exact_key = _cache_key(normalized, num_results, max_tokens, temperature)
+        cached, vector = self._cache_lookup(normalized, exact_key)
+        if cached is not None:
+            return self._cached_result(question, cached, time.perf_counter() - start_time)
         
         try:
             # Call Bedrock RetrieveAndGenerate API
-            response = self.bedrock_agent.retrieve_and_generate(
-                input={
-                    'text': question
-                },
-                retrieveAndGenerateConfiguration={
-                    'type': 'KNOWLEDGE_BASE',
-                    'knowledgeBaseConfiguration': {
-                        'knowledgeBaseId': self.kb_id,
-                        'modelArn': self.model_arn,
-                        'retrievalConfiguration': {
-                            'vectorSearchConfiguration': {
-                                'numberOfResults': num_results
-                            }
-                        },
-                        'generationConfiguration': {
-                            'inferenceConfig': {
-                                'textInferenceConfig': {
-                                    'maxTokens': max_tokens,
-                                    'temperature': temperature
-                                }
-                            }
-                        }
-                    }
-                }
+            response = self._retrieve_and_generate(
+                **self._request(question, num_results, max_tokens, temperature)
             )
             
-            elapsed_time = time.time() - start_time
-            
             # Extract answer
             answer = response.get('output', {}).get('text', 'No answer generated')
             
-            # Extract citations
-            citations = []
-            for citation in response.get('citations', []):
-                for reference in citation.get('retrievedReferences', []):
-                    citations.append({
-                        'content': reference.get('content', {}).get('text', ''),
-                        'location': reference.get('location', {}),
-                        'metadata': reference.get('metadata', {})
-                    })
-            
-            logger.success(f"Regulations query completed in {elapsed_time:.2f}s")
-            logger.info(f"  • Answer length: {len(answer)} chars")
-            logger.info(f"  • Citations: {len(citations)}")
+            # Citations are parsed in one pass in _success_result
+            references = (
+                reference
+                for citation in response.get('citations', ())
+                for reference in citation.get('retrievedReferences', ())
+            )
             
-            return {
-                'type': 'text',
-                'content': answer,
-                'metadata': {
-                    'status': 'success',
-                    'question': question,
-                    'latency_seconds': elapsed_time,
-                    'citations': citations,
-                    'num_results': num_results,
-                    'model': settings.bedrock_generation_model
-                }
-            }
+            result = self._success_result(question, answer, references, num_results, time.perf_counter() - start_time)
             
-        except ClientError as e:
-            error_code = e.response.get('Error', {}).get('Code', 'Unknown')
-            error_msg = e.response.get('Error', {}).get('Message', str(e))
+        except Exception as e:
+            return self._error_result(question, e)
+        
+        self._store(normalized, exact_key, vector, result)
+        return result
+
+    @_sampled_traceable(name="query_regulations_stream", tags=["rag", "bedrock", "regulations", "stream"])
+    def query_regulations_stream(
+        self,
+        question: str,
+        num_results: int = 5,
+        max_tokens: int = 1500,
+        temperature: float = 0.3
+    ) -> Iterator[str]:
+        """
+        Stream the answer to a regulations question as it is generated.
+        
+        Uses RetrieveAndGenerateStream, so the first text arrives after
+        retrieval plus the first generated tokens instead of after the whole
+        answer. The finished answer is cached like query_regulations (a
+        cached answer is yielded as a single chunk, and the hit is recorded
+        on the trace as cache_hit).
+        
+        Args:
+            question: F1 regulations question
+            num_results: Number of chunks to retrieve (default: 5)
+            max_tokens: Maximum tokens in generated response (default: 1500)
+            temperature: Generation temperature (default: 0.3 for factual)
             
-            logger.error(f"Bedrock API error: {error_code} - {error_msg}")
+        Yields:
+            Answer text chunks (on failure, the error message as the last chunk)
+        """
+        logger.debug("Streaming regulations: '{}'", question)
+        start_time = time.perf_counter()
+        
+        normalized = _normalize_question(question)
+        exact_key = _cache_key(normalized, num_results, max_tokens, temperature)
+        cached, vector = self._cache_lookup(normalized, exact_key)
+        if cached is not None:
+            yield self._cached_result(question, cached, time.perf_counter() - start_time)['content']
+            return
+        
+        parts: List[str] = []
+        references: List[Dict[str, Any]] = []
+        
+        try:
+            response = self._retrieve_and_generate_stream(
+                **self._request(question, num_results, max_tokens, temperature)
+            )
             
-            return {
-                'type': 'error',
-                'content': f"Bedrock API error: {error_msg}",
-                'metadata': {
-                    'status': 'error',
-                    'error_code': error_code,
-                    'error_message': error_msg,
-                    'question': question
-                }
-            }
+            for event in response['stream']:
+                if 'output' in event:
+                    text = event['output'].get('text', '')
+                    if text:
+                        parts.append(text)
+                        yield text
+                elif 'citation' in event:
+                    citation = event['citation']
+                    references.extend(
+                        citation.get('retrievedReferences')
+                        or citation.get('citation', _NO_CONTENT).get('retrievedReferences', ())
+                    )
             
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            yield self._error_result(question, e)['content']
+            return
+        
+        result = self._success_result(
+            question, "".join(parts) or 'No answer generated', references, num_results, time.perf_counter() - start_time
+        )
+        self._store(normalized, exact_key, vector, result)
+
+    async def aquery_regulations(self, question: str, **kwargs) -> Dict[str, Any]:
+        """
+        Async query_regulations for use on an event loop.
+        
+        Runs the blocking Bedrock call on the tool's own worker pool, so
+        many questions can be awaited together (asyncio.gather) without
+        queueing behind asyncio's small default executor.
+        
+        Args:
+            question: F1 regulations question
+            **kwargs: Passed to query_regulations
             
-            return {
-                'type': 'error',
-                'content': f"Unexpected error: {str(e)}",
-                'metadata': {
-                    'status': 'error',
-                    'error': str(e),
-                    'question': question
-                }
-            }
+        Returns:
+            Same result dict as query_regulations
+        """
+        loop = asyncio.get_running_loop()
+        call = partial(self.query_regulations, question, **kwargs)
+        # Copy the context so LangSmith traces nest under the caller's run
+        return await loop.run_in_executor(self._executor, contextvars.copy_context().run, call)
+
+    def query_regulations_batch(self, questions: List[str], **kwargs) -> List[Dict[str, Any]]:
+        """
+        Answer several questions concurrently.
+        
+        N questions take about as long as the slowest one instead of N
+        sequential Bedrock round-trips.
+        
+        Args:
+            questions: F1 regulations questions
+            **kwargs: Passed to query_regulations
+            
+        Returns:
+            Result dicts in the same order as questions
+        """
+        futures = [
+            self._executor.submit(contextvars.copy_context().run, self.query_regulations, question, **kwargs)
+            for question in questions
+        ]
+        return [future.result() for future in futures]
+
+    def _store(self, question: str, exact_key: tuple, vector: Optional[List[float]], result: Dict[str, Any]):
+        """Store a successful result in both answer caches (question normalized)."""
+        self._store_exact(exact_key, result)
+        if vector is not None:
+            self._semantic_cache.put(question, exact_key[1:], vector, result)
+
+    def _store_exact(self, key: tuple, result: Dict[str, Any]):
+        """Store a successful result in the exact-match cache (LRU eviction)."""
+        with self._exact_cache_lock:
+            self._exact_cache[key] = (result, time.time())
+            self._exact_cache.move_to_end(key)
+            if len(self._exact_cache) > EXACT_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
 
 
 # Singleton instance
@@ -10,18 +10,51 @@ Features:
 """
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx
 from pathlib import Path
+import os
+import re
 import sys
+import threading
 import time
-from PIL import Image
+from typing import Optional, Tuple
+
+# Export LangChain callback traces on a background thread, not on the
+# response path (the langsmith @traceable client already batches in the
+# background). Set before the agent stack is imported
+os.environ.setdefault("LANGCHAIN_CALLBACKS_BACKGROUND", "true")
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.agents.orchestrator import get_orchestrator
+from src.tools.circuit_retrieval import get_circuit_retrieval
 from loguru import logger
 
+# Streamlit static file serving (enableStaticServing): files in src/ui/static
+# are served at /app/static
+STATIC_DIR = Path(__file__).parent / "static"
+STATIC_URL = "app/static"
+
+# Response lines that look like file paths or source references are hidden
+# ("image source:" and "_circuit.webp" are covered by shorter alternatives)
+SKIP_LINE_PATTERN = re.compile(
+    r"f1_2025_circuit_maps|circuit\.webp|source:|path:|/volumes/|retrieved from:",
+    re.IGNORECASE
+)
+
+# Min seconds between redraws of a streaming answer: each redraw re-parses
+# the whole Markdown text, so token-rate updates get slower as it grows
+STREAM_FLUSH_SECONDS = 0.1
+
+# Messages rendered per rerun; "Load earlier messages" shows this many more
+RENDER_WINDOW = 20
+
+# Messages kept for display per session (each holds a full result dict).
+# conversation_history (plain text) is kept whole: the orchestrator trims
+# it to its window and summarizes older messages itself
+MAX_MESSAGES = 50
+
 # Configure page
 st.set_page_config(
     page_title="F1 Service System",
@@ -30,276 +63,68 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Custom CSS - Red Bull Racing Theme (Red & Black)
-st.markdown("""
-<style>
-    /* Import F1 Font */
-    @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@400;500;700;900&family=Rajdhani:wght@300;400;500;600;700&display=swap');
-    
-    /* Main background - Dark theme */
-    .stApp {
-        background: linear-gradient(135deg, #0a0a0a 0%, #1a0000 100%);
-        color: #ffffff;
-        font-family: 'Rajdhani', sans-serif;
-    }
-    
-    /* Title styling - Futuristic */
-    h1 {
-        font-family: 'Orbitron', sans-serif;
-        font-weight: 900;
-        font-size: 3.5rem !important;
-        background: linear-gradient(135deg, #dc0000 0%, #ff4444 50%, #dc0000 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        text-align: center;
-        letter-spacing: 3px;
-        text-transform: uppercase;
-        margin-bottom: 0.5rem;
-        text-shadow: 0 0 30px rgba(220, 0, 0, 0.5);
-    }
-    
-    /* Subtitle */
-    .subtitle {
-        font-family: 'Rajdhani', sans-serif;
-        font-size: 1.2rem;
-        text-align: center;
-        color: #888888;
-        letter-spacing: 2px;
-        margin-bottom: 2rem;
-        font-weight: 300;
-    }
-    
-    /* Chat input box - Futuristic red glow */
-    .stChatInput {
-        background: rgba(20, 20, 20, 0.8) !important;
-        border: 2px solid #dc0000 !important;
-        border-radius: 12px !important;
-        box-shadow: 0 0 20px rgba(220, 0, 0, 0.3) !important;
-    }
-    
-    .stChatInput input {
-        color: #ffffff !important;
-        font-family: 'Rajdhani', sans-serif;
-        font-size: 1.1rem !important;
-        font-weight: 500;
-    }
-    
-    .stChatInput input::placeholder {
-        color: #666666 !important;
-    }
-    
-    /* Chat messages - Modern cards */
-    .stChatMessage {
-        background: rgba(20, 20, 20, 0.6) !important;
-        border-radius: 15px !important;
-        border: 1px solid rgba(220, 0, 0, 0.2) !important;
-        padding: 1.5rem !important;
-        margin: 1rem 0 !important;
-        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.3) !important;
-        backdrop-filter: blur(10px);
-    }
-    
-    /* Chat avatars ONLY - 300% bigger (target avatar container, not content images) */
-    [data-testid="stChatMessageAvatarContainer"] img {
-        width: 120px !important;
-        height: 120px !important;
-        border-radius: 50%;
-        border: 3px solid #dc0000;
-        box-shadow: 0 0 20px rgba(220, 0, 0, 0.5);
-    }
-    
-    /* User message - Red accent */
-    [data-testid="stChatMessageContent"]:has(.user-message) {
-        border-left: 4px solid #dc0000 !important;
-    }
-    
-    /* Assistant message - Dark with subtle glow */
-    [data-testid="stChatMessageContent"]:has(.assistant-message) {
-        border-left: 4px solid #444444 !important;
-    }
-    
-    /* Message text - Increased size and padding by 300% with Formula 1 font */
-    .user-message, .assistant-message {
-        font-family: 'Formula1', sans-serif;
-        font-size: 2.0rem !important;
-        line-height: 1.6;
-        color: #e0e0e0;
-        font-weight: 400;
-        padding: 3.8rem !important;
-    }
-    
-    /* Default message text */
-    .stMarkdown {
-        font-family: 'Formula1', 'Rajdhani', sans-serif;
-        font-size: 1.1rem;
-        line-height: 1.6;
-        color: #e0e0e0;
-        font-weight: 400;
-    }
-    
-    /* Images - Futuristic frame */
-    .stImage {
-        border-radius: 15px;
-        border: 2px solid #dc0000;
-        box-shadow: 0 0 30px rgba(220, 0, 0, 0.4);
-        overflow: hidden;
-    }
-    
-    /* Buttons - Red Bull style */
-    .stButton button {
-        background: linear-gradient(135deg, #dc0000 0%, #aa0000 100%);
-        color: white;
-        border: none;
-        border-radius: 8px;
-        padding: 0.75rem 2rem;
-        font-family: 'Orbitron', sans-serif;
-        font-weight: 700;
-        font-size: 1rem;
-        letter-spacing: 1px;
-        text-transform: uppercase;
-        box-shadow: 0 4px 15px rgba(220, 0, 0, 0.4);
-        transition: all 0.3s ease;
-    }
-    
-    .stButton button:hover {
-        background: linear-gradient(135deg, #ff0000 0%, #cc0000 100%);
-        box-shadow: 0 6px 25px rgba(220, 0, 0, 0.6);
-        transform: translateY(-2px);
-    }
-    
-    /* Sidebar - Dark theme */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #0f0f0f 0%, #1a0000 100%);
-        border-right: 2px solid #dc0000;
-    }
-    
-    /* Metrics - Racing style */
-    .stMetric {
-        background: rgba(20, 20, 20, 0.8);
-        padding: 1rem;
-        border-radius: 10px;
-        border: 1px solid rgba(220, 0, 0, 0.3);
-        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2);
-    }
-    
-    .stMetric label {
-        color: #888888 !important;
-        font-family: 'Orbitron', sans-serif;
-        font-size: 0.9rem;
-        letter-spacing: 1px;
-        text-transform: uppercase;
-    }
-    
-    .stMetric [data-testid="stMetricValue"] {
-        color: #dc0000 !important;
-        font-family: 'Orbitron', sans-serif;
-        font-weight: 700;
-        font-size: 2rem;
-    }
-    
-    /* Loading spinner - Red */
-    .stSpinner > div {
-        border-top-color: #dc0000 !important;
-    }
-    
-    /* Expander - Modern style */
-    .streamlit-expanderHeader {
-        background: rgba(20, 20, 20, 0.6);
-        border: 1px solid rgba(220, 0, 0, 0.3);
-        border-radius: 8px;
-        font-family: 'Rajdhani', sans-serif;
-        font-weight: 600;
-        color: #ffffff;
-    }
-    
-    .streamlit-expanderHeader:hover {
-        border-color: #dc0000;
-        box-shadow: 0 0 15px rgba(220, 0, 0, 0.3);
-    }
-    
-    /* Info box - Futuristic */
-    .stAlert {
-        background: rgba(220, 0, 0, 0.1);
-        border: 1px solid rgba(220, 0, 0, 0.3);
-        border-radius: 10px;
-        color: #ffffff;
-        font-family: 'Rajdhani', sans-serif;
-    }
-    
-    /* Code blocks - Terminal style */
-    code {
-        background: rgba(0, 0, 0, 0.6) !important;
-        color: #dc0000 !important;
-        border: 1px solid rgba(220, 0, 0, 0.3) !important;
-        border-radius: 4px;
-        padding: 2px 6px;
-        font-family: 'Courier New', monospace;
-    }
-    
-    /* Scrollbar - Red theme */
-    ::-webkit-scrollbar {
-        width: 10px;
-        height: 10px;
-    }
-    
-    ::-webkit-scrollbar-track {
-        background: #0a0a0a;
-    }
-    
-    ::-webkit-scrollbar-thumb {
-        background: linear-gradient(180deg, #dc0000 0%, #aa0000 100%);
-        border-radius: 5px;
-    }
-    
-    ::-webkit-scrollbar-thumb:hover {
-        background: linear-gradient(180deg, #ff0000 0%, #cc0000 100%);
-    }
-    
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    
-    /* Racing stripe decoration */
-    .racing-stripe {
-        height: 4px;
-        background: linear-gradient(90deg, 
-            transparent 0%, 
-            #dc0000 20%, 
-            #dc0000 80%, 
-            transparent 100%);
-        margin: 2rem 0;
-        box-shadow: 0 0 10px rgba(220, 0, 0, 0.5);
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Initialize orchestrator
-@st.cache_resource
+# Custom CSS - Red Bull Racing Theme (Red & Black). The stylesheet is served
+# from src/ui/static, so each rerun sends a one-line <link> the browser
+# already has cached instead of the full CSS
+st.markdown(f'<link rel="stylesheet" href="{STATIC_URL}/app.css">', unsafe_allow_html=True)
+
+# Initialize orchestrator (main() shows the wait state, not a function-name spinner)
+@st.cache_resource(show_spinner=False)
 def init_orchestrator():
-    """Initialize orchestrator singleton."""
+    """Initialize orchestrator singleton and warm up its tools in the background."""
+    # Imported here: the agent stack isn't needed to paint the welcome screen
+    from src.agents.orchestrator import get_orchestrator
+    
     logger.info("Initializing orchestrator for Streamlit UI")
-    return get_orchestrator()
+    orchestrator = get_orchestrator()
+    threading.Thread(target=orchestrator.warm_up, name="warm-up", daemon=True).start()
+    return orchestrator
 
 
-def display_welcome():
-    """Display welcome screen with F1 branding."""
+@st.cache_resource(show_spinner=False)
+def start_orchestrator_init() -> threading.Thread:
+    """
+    Build the orchestrator in the background once per server process.
+    
+    Runs when the script first loads, so the welcome screen paints right
+    away and the first query finds init_orchestrator's cache warm instead
+    of paying the cold start. A failure here is raised again (and shown)
+    by the init_orchestrator call in main().
+    """
+    thread = threading.Thread(target=init_orchestrator, name="orchestrator-init", daemon=True)
+    add_script_run_ctx(thread)
+    thread.start()
+    return thread
+
+
+# Skipped under runOnSave, where every edit would start another init
+if os.environ.get("STREAMLIT_SERVER_RUN_ON_SAVE") != "true":
+    start_orchestrator_init()
+
+
+@st.cache_data
+def welcome_html() -> Tuple[str, str]:
+    """
+    Build the welcome banner and READY TO ASSIST card HTML.
+    
+    Images are referenced from Streamlit static serving (/app/static, see
+    .streamlit/config.toml), so the browser fetches and caches them once
+    instead of receiving them inline on every rerun.
+    
+    Returns:
+        (banner HTML, card HTML)
+    """
     # Load F1 logo as background
-    logo_path = Path(__file__).parent / "f1-logo.avif"
+    logo_path = STATIC_DIR / "f1-logo.avif"
     
     if logo_path.exists():
-        import base64
-        with open(logo_path, "rb") as img_file:
-            img_bytes = img_file.read()
-            img_base64 = base64.b64encode(img_bytes).decode()
-        
         # Fullscreen background logo with centered title
-        st.markdown(f"""
+        banner_html = f"""
         <div style='
             position: relative;
             width: 100%;
             height: 300px;
-            background-image: url(data:image/avif;base64,{img_base64});
+            background-image: url({STATIC_URL}/f1-logo.avif);
             background-size: cover;
             background-position: center;
             background-repeat: no-repeat;
@@ -325,95 +150,191 @@ def display_welcome():
             '>F1 SERVICE SYSTEM</h1>
         </div>
         <div class="racing-stripe"></div>
-        """, unsafe_allow_html=True)
+        """
     else:
         # Fallback without background image
-        st.markdown("""
+        banner_html = """
         <h1>F1 SERVICE SYSTEM</h1>
         <div class="racing-stripe"></div>
-        """, unsafe_allow_html=True)
+        """
+    
+    # Load Max Verstappen image for READY TO ASSIST frame
+    max_img_path = STATIC_DIR / "max.avif"
+    max_img_html = ""
+    if max_img_path.exists():
+        max_img_html = f'<img src="{STATIC_URL}/max.avif" style="width: 90%; height: 800px; object-fit: cover; object-position: center top; margin-bottom: 1.5rem;">'
+    
+    card_html = f"""
+    <div style='text-align: center; padding: 2rem; background: rgba(20,20,20,0.6); 
+                border-radius: 15px; border: 1px solid rgba(220,0,0,0.3);'>
+        {max_img_html}
+        <h3 style='color: #dc0000; font-family: Orbitron; margin-bottom: 1rem;'>
+            READY TO ASSIST
+        </h3>
+        <p style='color: #cccccc; font-size: 1.1rem; line-height: 1.8;'>
+            • Query F1 circuit layouts and maps<br>
+            • Access official FIA regulations<br>
+            • Get instant, accurate answers<br>
+        </p>
+    </div>
+    """
+    
+    return banner_html, card_html
+
+
+@st.cache_data(show_spinner=False)
+def read_asset(path: str, mtime: float) -> bytes:
+    """
+    Read a local asset once per process (mtime in the key picks up edits).
+    
+    Used for files outside src/ui/static (e.g. the theme music in music/),
+    which st.audio would otherwise re-read from disk on every play.
+    """
+    return Path(path).read_bytes()
+
+
+def display_welcome():
+    """Display welcome screen with F1 branding."""
+    banner_html, card_html = welcome_html()
+    
+    st.markdown(banner_html, unsafe_allow_html=True)
     
     # Welcome message in columns
     col1, col2, col3 = st.columns([1, 2, 1])
     
     with col2:
-        # Load Max Verstappen image for READY TO ASSIST frame
-        max_img_path = Path(__file__).parent / "max.avif"
-        max_img_html = ""
-        if max_img_path.exists():
-            import base64
-            with open(max_img_path, "rb") as img_file:
-                max_bytes = img_file.read()
-                max_base64 = base64.b64encode(max_bytes).decode()
-                max_img_html = f'<img src="data:image/avif;base64,{max_base64}" style="width: 90%; height: 800px; object-fit: cover; object-position: center top; margin-bottom: 1.5rem;">'
-        
-        st.markdown(f"""
-        <div style='text-align: center; padding: 2rem; background: rgba(20,20,20,0.6); 
-                    border-radius: 15px; border: 1px solid rgba(220,0,0,0.3);'>
-            {max_img_html}
-            <h3 style='color: #dc0000; font-family: Orbitron; margin-bottom: 1rem;'>
-                READY TO ASSIST
-            </h3>
-            <p style='color: #cccccc; font-size: 1.1rem; line-height: 1.8;'>
-                • Query F1 circuit layouts and maps<br>
-                • Access official FIA regulations<br>
-                • Get instant, accurate answers<br>
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(card_html, unsafe_allow_html=True)
         
         # Add Max's theme music button
         music_path = Path(__file__).parent.parent.parent / "music" / "tu-tu-tu-du-max-verstappen.mp3"
         if music_path.exists():
             if st.button("It's Verstappen Time", use_container_width=True):
-                st.audio(str(music_path), format="audio/mp3", autoplay=True)
+                audio = read_asset(str(music_path), music_path.stat().st_mtime)
+                st.audio(audio, format="audio/mp3", autoplay=True)
 
 
-def display_circuit_image(image_path: str, location: str):
+@st.cache_data
+def circuit_width(image_path: str) -> int:
+    """Pixel width of a circuit map (header read once per path, not per rerun)."""
+    # Pillow is only needed once a circuit map is shown
+    from PIL import Image
+    
+    with Image.open(image_path) as image:
+        return image.width
+
+
+def display_circuit_image(image_path: str, location: str, normalized: str = None):
     """Display circuit image with futuristic styling."""
     try:
-        image = Image.open(image_path)
+        # Preloaded bytes when available; the file is the fallback. Either is
+        # passed to st.image as-is: Streamlit serves the original WebP bytes
+        # instead of re-encoding a decoded PIL image to PNG
+        image_bytes = get_circuit_retrieval().get_image_bytes(normalized) if normalized else None
         
         # Display with caption - 90% width to fit on one page
         st.image(
-            image,
+            image_bytes or image_path,
             caption=f"🏁 {location.replace('_', ' ')} Circuit",
-            width=int(image.width * 0.9)
+            width=int(circuit_width(image_path) * 0.9)
         )
         
     except Exception as e:
         st.error(f"Failed to load circuit image: {e}")
 
 
-def format_response_with_metadata(result: dict):
-    """Format response with metadata display."""
+def prepare_message(result: dict) -> dict:
+    """
+    Precompute a response's rendered parts once, when it is added to history.
+    
+    Stores the filtered message HTML, tools list and citation count on the
+    result, so reruns re-rendering the message skip the content filter, and
+    gives it a session-unique key for its Technical Details toggle.
+    """
     content = result.get('content', '')
-    tools_used = result.get('tools_used', [])
-    metadata = result.get('metadata', {})
     tool_results = result.get('tool_results', {})
     
     # Filter out image paths from content (remove lines containing circuit map paths)
     if content:
-        lines = content.split('\n')
-        filtered_lines = []
-        for line in lines:
-            # Skip lines that look like file paths or source references
-            if not any(keyword in line.lower() for keyword in [
-                'f1_2025_circuit_maps',
-                '_circuit.webp',
-                'source:',
-                'image source:',
-                'path:',
-                '/volumes/',
-                'retrieved from:',
-                'circuit.webp'
-            ]):
-                filtered_lines.append(line)
-        content = '\n'.join(filtered_lines).strip()
+        content = '\n'.join(
+            line for line in content.split('\n') if not SKIP_LINE_PATTERN.search(line)
+        ).strip()
+    
+    citations = tool_results.get('query_regulations', {}).get('metadata', {}).get('citations', [])
+    
+    result['_cached_html'] = f"<div class='assistant-message'>{content}</div>" if content else ""
+    result['_cached_tools'] = result.get('tools_used', [])
+    result['_cached_citations'] = len(citations)
+    
+    st.session_state.message_seq = st.session_state.get('message_seq', 0) + 1
+    result['_details_key'] = f"details_{st.session_state.message_seq}"
+    return result
+
+
+def stream_text(events, result: dict):
+    """
+    Yield answer text from orchestrator stream events.
+    
+    Args:
+        events: Events from orchestrator.stream_query
+        result: Filled in with the final result from the "done" event
+    """
+    for event in events:
+        if event["event"] == "text":
+            yield event["content"]
+        elif event["event"] == "done":
+            result.update(event["result"])
+
+
+def render_stream(content_slot, chunks) -> str:
+    """
+    Render streamed text into a placeholder, coalescing updates.
+    
+    The text is redrawn at most once per STREAM_FLUSH_SECONDS (and once at
+    the end), however fast chunks arrive.
+    
+    Args:
+        content_slot: st.empty() placeholder
+        chunks: Text chunks
+        
+    Returns:
+        Full streamed text
+    """
+    parts = []
+    last_flush = 0.0
+    
+    for chunk in chunks:
+        parts.append(chunk)
+        now = time.monotonic()
+        if now - last_flush >= STREAM_FLUSH_SECONDS:
+            content_slot.markdown("".join(parts))
+            last_flush = now
+    
+    text = "".join(parts)
+    content_slot.markdown(text)
+    return text
+
+
+def format_response_with_metadata(result: dict, content_slot=None):
+    """
+    Format response with metadata display.
+    
+    Args:
+        result: Orchestrator result
+        content_slot: st.empty() holding the streamed answer, replaced by
+            the formatted message (default: render in place)
+    """
+    if '_cached_html' not in result:
+        prepare_message(result)
+    
+    tools_used = result['_cached_tools']
+    metadata = result.get('metadata', {})
+    tool_results = result.get('tool_results', {})
     
     # Display main content (filtered)
-    if content:
-        st.markdown(f"<div class='assistant-message'>{content}</div>", unsafe_allow_html=True)
+    if result['_cached_html']:
+        (content_slot or st).markdown(result['_cached_html'], unsafe_allow_html=True)
+    elif content_slot is not None:
+        content_slot.empty()
     
     # Display circuit image if available
     if 'get_circuit_image' in tool_results:
@@ -421,13 +342,20 @@ def format_response_with_metadata(result: dict):
         if circuit_result.get('type') == 'image':
             image_path = circuit_result.get('content')
             location = circuit_result.get('metadata', {}).get('location', 'Unknown')
+            normalized = circuit_result.get('metadata', {}).get('normalized')
             
             st.markdown("<div style='margin: 1.5rem 0;'>", unsafe_allow_html=True)
-            display_circuit_image(image_path, location)
+            display_circuit_image(image_path, location, normalized)
             st.markdown("</div>", unsafe_allow_html=True)
     
-    # Metadata expander - Futuristic details
-    with st.expander("🔍 Technical Details", expanded=False):
+    # Technical details, rendered only while toggled open: a collapsed
+    # st.expander still builds its metrics on every rerun for every message
+    details_key = result['_details_key']
+    st.button("🔍 Technical Details", key=details_key, on_click=toggle_details, args=(details_key,))
+    if details_key not in st.session_state.get('open_details', set()):
+        return
+    
+    with st.container():
         col1, col2, col3 = st.columns(3)
         
         with col1:
@@ -459,23 +387,72 @@ def format_response_with_metadata(result: dict):
                 st.markdown(f"• `{tool}`")
         
         # Citations if available
-        if 'query_regulations' in tool_results:
-            reg_result = tool_results['query_regulations']
-            citations = reg_result.get('metadata', {}).get('citations', [])
-            
-            if citations:
-                st.markdown(f"**Citations:** {len(citations)} regulation sources")
+        if result['_cached_citations']:
+            st.markdown(f"**Citations:** {result['_cached_citations']} regulation sources")
+
+
+@st.cache_resource
+def avatar_path(filename: str) -> Optional[str]:
+    """
+    Resolve a chat avatar image once per process.
+    
+    The path (not a decoded image) is passed to st.chat_message, which
+    serves the file as-is; None falls back to the default avatar.
+    """
+    path = Path(__file__).parent / filename
+    return str(path) if path.exists() else None
+
+
+def display_user_message(content: str):
+    """
+    Render a user message inside its chat_message container.
+    
+    Prompts are plain text, so st.text skips the Markdown pipeline; the
+    stylesheet styles it through the user chat_message's aria-label.
+    """
+    st.text(content)
+
+
+def toggle_details(details_key: str):
+    """Button callback: show or hide one message's technical details."""
+    open_details = st.session_state.setdefault('open_details', set())
+    if details_key in open_details:
+        open_details.discard(details_key)
+    else:
+        open_details.add(details_key)
+
+
+def queue_example(query: str):
+    """Sidebar button callback: queue an example query for processing."""
+    st.session_state.example_query = query
+
+
+def append_message(message: dict):
+    """Add a message to the display history, dropping the oldest beyond MAX_MESSAGES."""
+    messages = st.session_state.messages
+    messages.append(message)
+    
+    # Counted separately: old user messages are trimmed from the history
+    if message["role"] == "user":
+        st.session_state.query_count = st.session_state.get('query_count', 0) + 1
+    
+    if len(messages) > MAX_MESSAGES:
+        del messages[:-MAX_MESSAGES]
 
 
 def main():
     """Main Streamlit application."""
     
-    # Display welcome header
-    display_welcome()
+    # Display welcome header (only before the conversation starts: the
+    # banner and image card are large and would re-render on every rerun)
+    if not st.session_state.get('messages'):
+        display_welcome()
     
-    # Initialize orchestrator
+    # Initialize orchestrator (usually already built by start_orchestrator_init;
+    # the spinner only appears if it is still starting up)
     try:
-        orchestrator = init_orchestrator()
+        with st.spinner("Starting the F1 assistant..."):
+            orchestrator = init_orchestrator()
     except Exception as e:
         st.error(f"❌ Failed to initialize orchestrator: {e}")
         st.stop()
@@ -488,47 +465,63 @@ def main():
     if 'conversation_history' not in st.session_state:
         st.session_state.conversation_history = []
     
-    # Load custom avatar images
-    user_avatar_path = Path(__file__).parent / "user-icon.png"
-    chatbot_avatar_path = Path(__file__).parent / "chatbot-icon.png"
+    # Number of latest messages rendered (older ones stay in session state)
+    if 'render_window' not in st.session_state:
+        st.session_state.render_window = RENDER_WINDOW
     
-    user_avatar = str(user_avatar_path) if user_avatar_path.exists() else None
-    chatbot_avatar = str(chatbot_avatar_path) if chatbot_avatar_path.exists() else None
+    # Load custom avatar images
+    user_avatar = avatar_path("user-icon.png")
+    chatbot_avatar = avatar_path("chatbot-icon.png")
+    
+    # Display chat history: only the latest messages are re-rendered on
+    # each rerun, so long sessions don't slow down every interaction
+    render_window = st.session_state.render_window
+    if len(st.session_state.messages) > render_window:
+        if st.button("Load earlier messages"):
+            st.session_state.render_window = render_window + RENDER_WINDOW
+            st.rerun()
     
-    # Display chat history
-    for message in st.session_state.messages:
+    for message in st.session_state.messages[-render_window:]:
         avatar = user_avatar if message["role"] == "user" else chatbot_avatar
         with st.chat_message(message["role"], avatar=avatar):
             if message["role"] == "user":
-                st.markdown(f"<div class='user-message'>{message['content']}</div>",
-                           unsafe_allow_html=True)
+                display_user_message(message['content'])
             else:
                 # Assistant message with full formatting
                 format_response_with_metadata(message.get('result', {}))
     
-    # Chat input
-    if prompt := st.chat_input("Ask about F1 circuits or regulations..."):
+    # Chat input, or a quick command queued by a sidebar button
+    prompt = st.chat_input("Ask about F1 circuits or regulations...") or st.session_state.pop('example_query', None)
+    if prompt:
         # Add user message to chat history (for display)
-        st.session_state.messages.append({
+        append_message({
             "role": "user",
             "content": prompt
         })
         
-        # Display user message
+        # Display user message (this run only; the history loop above ran
+        # before the append, so the message is drawn once per run)
         with st.chat_message("user", avatar=user_avatar):
-            st.markdown(f"<div class='user-message'>{prompt}</div>", unsafe_allow_html=True)
+            display_user_message(prompt)
         
         # Process query with orchestrator
         with st.chat_message("assistant", avatar=chatbot_avatar):
+            # Answer text is shown as it streams in; once complete it is
+            # replaced by the filtered, styled message
+            content_slot = st.empty()
+            
             with st.spinner("Processing...🏎️💨💨"):
                 start_time = time.time()
                 
                 try:
                     # Call orchestrator WITH conversation history for context
-                    result = orchestrator.process_query(
+                    result = {}
+                    events = orchestrator.stream_query(
                         prompt,
-                        conversation_history=st.session_state.conversation_history
+                        # Snapshot: the stream runs on the agent thread
+                        conversation_history=list(st.session_state.conversation_history)
                     )
+                    render_stream(content_slot, stream_text(events, result))
                     elapsed_time = time.time() - start_time
                     
                     # Add response time to metadata
@@ -536,11 +529,14 @@ def main():
                         result['metadata'] = {}
                     result['metadata']['response_time'] = round(elapsed_time, 2)
                     
-                    # Display response
-                    format_response_with_metadata(result)
+                    # Filter content and count tools/citations once for all reruns
+                    prepare_message(result)
+                    
+                    # Display response (image, details) now the answer is complete
+                    format_response_with_metadata(result, content_slot)
                     
                     # Add to chat history (for display with full metadata)
-                    st.session_state.messages.append({
+                    append_message({
                         "role": "assistant",
                         "content": result.get('content', ''),
                         "result": result
@@ -556,13 +552,6 @@ def main():
                         "content": result.get('content', '')
                     })
                     
-                    # Limit conversation history to last 20 messages (10 exchanges)
-                    # to prevent token overflow
-                    if len(st.session_state.conversation_history) > 20:
-                        st.session_state.conversation_history = (
-                            st.session_state.conversation_history[-20:]
-                        )
-                    
                 except Exception as e:
                     error_msg = f"Error processing query: {str(e)}"
                     st.error(error_msg)
@@ -583,8 +572,7 @@ def main():
         st.markdown(f"**Tools:** {len(orchestrator.tools)}")
         
         # Query count
-        query_count = len([m for m in st.session_state.messages if m['role'] == 'user'])
-        st.markdown(f"**Queries:** {query_count}")
+        st.markdown(f"**Queries:** {st.session_state.get('query_count', 0)}")
         
         # Memory status
         memory_count = len(st.session_state.get('conversation_history', []))
@@ -597,17 +585,14 @@ def main():
         # Example queries
         st.markdown("**Quick Commands:**")
         
-        if st.button("🏁 Show Monaco Circuit", use_container_width=True):
-            st.session_state.example_query = "Show me the Monaco circuit"
-            st.rerun()
-        
-        if st.button("📋 Points System", use_container_width=True):
-            st.session_state.example_query = "How many points for 1st place?"
-            st.rerun()
-        
-        if st.button("⚡ DRS Rules", use_container_width=True):
-            st.session_state.example_query = "What are the DRS rules?"
-            st.rerun()
+        # Callbacks run before the rerun a click triggers, so the query is
+        # answered in that same rerun
+        st.button("🏁 Show Monaco Circuit", use_container_width=True,
+                  on_click=queue_example, args=("Show me the Monaco circuit",))
+        st.button("📋 Points System", use_container_width=True,
+                  on_click=queue_example, args=("How many points for 1st place?",))
+        st.button("⚡ DRS Rules", use_container_width=True,
+                  on_click=queue_example, args=("What are the DRS rules?",))
         
         st.markdown("<div class='racing-stripe' style='margin: 2rem 0;'></div>",
                    unsafe_allow_html=True)
@@ -616,6 +601,9 @@ def main():
         if st.button("🗑️ Clear Chat", use_container_width=True):
             st.session_state.messages = []
             st.session_state.conversation_history = []
+            st.session_state.query_count = 0
+            st.session_state.render_window = RENDER_WINDOW
+            st.session_state.open_details = set()
             st.rerun()
         
         # Footer
@@ -625,18 +613,6 @@ def main():
             <p style='margin-top: 0.5rem;'>Powered by OpenAI & AWS Bedrock</p>
         </div>
         """, unsafe_allow_html=True)
-    
-    # Handle example queries from sidebar
-    if 'example_query' in st.session_state:
-        example = st.session_state.example_query
-        del st.session_state.example_query
-        
-        # Add to messages and process
-        st.session_state.messages.append({
-            "role": "user",
-            "content": example
-        })
-        st.rerun()
 
 
 if __name__ == "__main__":
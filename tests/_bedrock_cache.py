@@ -0,0 +1,60 @@
+"""
+Exact-match disk cache for Bedrock RetrieveAndGenerate responses.
+
+Opt-in (BEDROCK_TEST_CACHE=1) for the Bedrock test scripts, so repeated
+dev runs with unchanged prompts can skip the paid round trip. Off by
+default: a cache hit never reaches Bedrock, so its timing is not a
+Bedrock latency. Entries are JSON files named by the sha256 of the
+request parameters.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+# Project-root relative cache directory
+CACHE_DIR = Path(__file__).parent.parent / ".cache" / "bedrock"
+
+# Set BEDROCK_TEST_CACHE=1 to serve repeat requests from disk
+CACHE_ENABLED = os.getenv("BEDROCK_TEST_CACHE", "0") == "1"
+
+
+def cache_key(**params: Any) -> str:
+    """Build a stable cache key from request parameters."""
+    payload = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached response for key, or None on miss."""
+    if not CACHE_ENABLED:
+        return None
+    
+    path = CACHE_DIR / f"{key}.json"
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable cache entry {path.name}: {e}")
+        return None
+
+
+def put(key: str, response: Dict[str, Any]) -> None:
+    """Store a response under key."""
+    if not CACHE_ENABLED:
+        return
+    
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = CACHE_DIR / f"{key}.json"
+    
+    # Write then rename so concurrent readers never see a partial file
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(response, f, ensure_ascii=False, default=str)
+    tmp_path.replace(path)
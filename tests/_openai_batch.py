@@ -0,0 +1,54 @@
+"""
+OpenAI Batch API helper for the offline test modes.
+
+Scripts run with --batch submit their chat.completions requests as one
+Batch API job (half the token cost, no rate-limit pressure) instead of
+dispatching them one by one. Results arrive within the completion window,
+so this is for nightly / regeneration runs, not latency measurements.
+"""
+
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+# Batch API polling interval (seconds)
+BATCH_POLL_SECONDS = 30
+BATCH_FINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+
+def run_batch(client, requests: List[Dict[str, Any]], filename: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Submit requests as one Batch API job and wait for its results.
+
+    Args:
+        client: OpenAI client
+        requests: Batch request lines ({"custom_id", "method", "url", "body"})
+        filename: Name for the uploaded JSONL input file
+
+    Returns:
+        Parsed output lines (matched to requests by custom_id), or None if
+        the batch did not complete
+    """
+    payload = "\n".join(json.dumps(request) for request in requests).encode("utf-8")
+
+    batch_file = client.files.create(file=(filename, payload), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    print(f"\n📦 Submitted batch {batch.id} ({len(requests)} requests)")
+
+    while batch.status not in BATCH_FINAL_STATES:
+        time.sleep(BATCH_POLL_SECONDS)
+        batch = client.batches.retrieve(batch.id)
+        print(f"   Status: {batch.status}")
+
+    if batch.status != "completed" or not batch.output_file_id:
+        logger.error(f"Batch {batch.id} ended with status: {batch.status}")
+        return None
+
+    output = client.files.content(batch.output_file_id).text
+    return [json.loads(line) for line in output.splitlines()]
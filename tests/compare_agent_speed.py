@@ -1,111 +1,194 @@
 """
 Compare agent speed across different OpenAI models.
 Tests GPT-4o vs GPT-5 Mini performance.
-"""
 
-import sys
-import os
-import time
-from typing import Dict, Any
+Both models are queried concurrently for each test query, so the comparison
+takes roughly one round-trip per query instead of one per model per query.
 
-# Add project root to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+Run with --batch for an offline (e.g. nightly) check: the first, tool-routing
+turn of every (model, query) pair is submitted as a single OpenAI Batch API
+job at half the token cost. Batch results report routing and token usage;
+latency is only measured by the interactive mode.
 
-from src.agents.orchestrator import Orchestrator
+Queries the orchestrator answers without a model call (the plain circuit
+pattern, e.g. "Show me Monaco circuit", or the embedding router) would
+time no model at all, so the circuit query is phrased to need the model,
+and any run that still skips the model is left out of the comparison.
+"""
 
 import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
+import asyncio
 import time
-from src.agents.orchestrator import Orchestrator
-from src.config.settings import settings
+from typing import Dict, Any, Tuple
+
+from src.agents.orchestrator import get_orchestrator
 from loguru import logger
+from tests._openai_batch import run_batch
 
 # Suppress info logs for cleaner output
 logger.remove()
 logger.add(sys.stderr, level="WARNING")
 
+MODELS = ("gpt-4o", "gpt-5-mini")
 
-def test_speed(model_name: str, query: str):
+# Max in-flight agent runs (keeps us under the OpenAI rate limit)
+CONCURRENCY = 4
+
+# Untimed query sent to each model before measuring
+WARMUP_QUERY = "ping"
+
+
+async def test_speed(model_name: str, query: str) -> Tuple[float, Dict[str, Any]]:
     """Test agent speed with specific model."""
+    # One cached agent per model, reused for every query
+    agent = get_orchestrator(model_name)
+
+    start = time.time()
+    result = await agent.aprocess_query(query)
+    elapsed = time.time() - start
+
+    return elapsed, result
+
+
+async def _run(
+    model_name: str,
+    query: str,
+    semaphore: asyncio.Semaphore
+) -> Tuple[str, str, float, Dict[str, Any]]:
+    """Run one (model, query) pair on the event loop."""
+    async with semaphore:
+        elapsed, result = await test_speed(model_name, query)
+    return model_name, query, elapsed, result
+
+
+def print_run(model_name: str, query: str, elapsed: float, result: Dict[str, Any]):
+    """Print timing details for a single run."""
     print(f"\n{'='*60}")
     print(f"Testing: {model_name}")
     print(f"Query: {query}")
     print(f"{'='*60}")
-    
-    # Temporarily override model
-    original_model = settings.openai_model
-    settings.openai_model = model_name
-    
-    # Create fresh agent instance
-    from src.agents.orchestrator import _orchestrator_instance
-    import src.agents.orchestrator as agent_module
-    agent_module._orchestrator_instance = None
-    
-    agent = Orchestrator()
-    
-    start = time.time()
-    result = agent.process_query(query)
-    elapsed = time.time() - start
-    
-    # Restore original model
-    settings.openai_model = original_model
-    agent_module._gpt5_agent_instance = None
-    
     print(f"\n⏱️  Response Time: {elapsed:.2f}s")
     print(f"🔧 Tools Used: {result.get('tools_used', [])}")
     print(f"🔄 Iterations: {result.get('metadata', {}).get('iterations', 'N/A')}")
     print(f"✅ Status: {result.get('type')}")
-    
-    return elapsed
+
+
+async def warm_up(model_name: str):
+    """
+    Send one untimed query so connection setup (TLS handshake, pool) and
+    lazy client initialization stay out of the measured runs.
+    """
+    try:
+        await get_orchestrator(model_name).aprocess_query(WARMUP_QUERY)
+    except Exception as e:
+        logger.warning(f"Warm-up failed for {model_name}: {e}")
+
+
+async def run_comparison(test_queries, concurrency: int = CONCURRENCY) -> Dict[str, Dict[str, float]]:
+    """Run every model against every query concurrently."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    # Build and warm up each model's agent so cold-start cost stays out of the timings
+    await asyncio.gather(*[warm_up(model) for model in MODELS])
+
+    tasks = [_run(model, query, semaphore) for query in test_queries for model in MODELS]
+    runs = await asyncio.gather(*tasks)
+
+    timings: Dict[str, Dict[str, float]] = {query: {} for query in test_queries}
+    skipped = set()
+    for model_name, query, elapsed, result in runs:
+        print_run(model_name, query, elapsed, result)
+        timings[query][model_name] = elapsed
+        if result.get('metadata', {}).get('iterations') == 0:
+            skipped.add(query)
+
+    # No model call was made: the timing says nothing about the model
+    for query in skipped:
+        print(f"\n⚠️  Excluded from comparison (answered without a model call): {query}")
+        del timings[query]
+
+    return timings
+
+
+def run_batch_comparison(test_queries):
+    """Submit every (model, query) routing turn as one Batch API job and report results."""
+    requests = [
+        {
+            "custom_id": f"{model}|{query}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": get_orchestrator(model).first_turn_request(query)
+        }
+        for model in MODELS
+        for query in test_queries
+    ]
+
+    items = run_batch(get_orchestrator(MODELS[0]).client, requests, "compare_agent_speed.jsonl")
+    if items is None:
+        return
+
+    print(f"\n\n{'='*60}")
+    print("BATCH ROUTING SUMMARY")
+    print(f"{'='*60}")
+
+    for item in items:
+        model_name, query = item["custom_id"].split("|", 1)
+        body = item["response"]["body"]
+        message = body["choices"][0]["message"]
+        tool_names = [tc["function"]["name"] for tc in message.get("tool_calls") or []]
+        usage = body.get("usage", {})
+
+        print(f"\n{model_name} | {query}")
+        print(f"  🔧 Tools Selected: {tool_names}")
+        print(f"  🔢 Tokens: {usage.get('prompt_tokens', 0)} prompt / "
+              f"{usage.get('completion_tokens', 0)} completion")
 
 
 def main():
     print("\n🏎️ " * 20)
     print("SPEED COMPARISON: GPT-4o vs GPT-5 Mini")
     print("🏎️ " * 20)
-    
+
     test_queries = [
-        "Show me Monaco circuit",
+        # Not "Show me Monaco circuit": that matches the circuit fast path
+        "Can I see the Monaco circuit layout?",
         "How many points for 1st place?",
     ]
-    
+
+    if "--batch" in sys.argv[1:]:
+        run_batch_comparison(test_queries)
+        return
+
+    start = time.time()
+    timings = asyncio.run(run_comparison(test_queries))
+    wall_clock = time.time() - start
+
     results = {}
-    
-    for query in test_queries:
-        print(f"\n\n{'#'*60}")
-        print(f"QUERY: {query}")
-        print(f"{'#'*60}")
-        
-        # Test GPT-4o
-        gpt4o_time = test_speed("gpt-4o", query)
-        
-        # Small pause
-        time.sleep(2)
-        
-        # Test GPT-5 Mini
-        gpt5_time = test_speed("gpt-5-mini", query)
-        
+    for query, times in timings.items():
         results[query] = {
-            "gpt-4o": gpt4o_time,
-            "gpt-5-mini": gpt5_time,
-            "speedup": gpt5_time / gpt4o_time
+            "gpt-4o": times["gpt-4o"],
+            "gpt-5-mini": times["gpt-5-mini"],
+            "speedup": times["gpt-5-mini"] / times["gpt-4o"]
         }
-    
+
     # Summary
     print(f"\n\n{'='*60}")
     print("SPEED COMPARISON SUMMARY")
     print(f"{'='*60}")
-    
+
     for query, times in results.items():
         print(f"\nQuery: {query}")
         print(f"  GPT-4o:     {times['gpt-4o']:.2f}s ⚡")
         print(f"  GPT-5 Mini: {times['gpt-5-mini']:.2f}s")
         print(f"  Speedup:    {times['speedup']:.2f}x faster with GPT-4o")
-    
+
+    if not results:
+        print("\nNo query reached the models; nothing to compare")
+        return
+
     avg_speedup = sum(r['speedup'] for r in results.values()) / len(results)
     print(f"\n🚀 Average Speedup: GPT-4o is {avg_speedup:.2f}x FASTER")
+    print(f"⏱️  Total wall-clock: {wall_clock:.2f}s")
     print(f"\n💡 Recommendation: Use GPT-4o for production (sub-10s responses)")
 
 
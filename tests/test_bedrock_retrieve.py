@@ -1,12 +1,7 @@
 """Test Bedrock Knowledge Base retrieval (chunks only, no generation)"""
-import sys
-import os
 import boto3
 from loguru import logger
 
-# Add src to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 from src.config.settings import settings
 from src.utils.logger import setup_logger
 
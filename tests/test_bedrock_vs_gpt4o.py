@@ -3,10 +3,6 @@ Side-by-Side Comparison: Bedrock RetrieveAndGenerate vs Bedrock Retrieve + GPT-4
 Compare both latency and output quality for accuracy inspection.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 import time
 import boto3
 from openai import OpenAI
@@ -14,6 +10,24 @@ from loguru import logger
 from src.config.settings import settings
 
 
+# Prompt pieces for the Retrieve + GPT-4o path, built once at import
+SYSTEM_PROMPT = """You are an expert F1 regulations assistant with deep knowledge of FIA Formula 1 rules.
+
+Answer the question based ONLY on the provided regulation chunks.
+Be precise, cite article numbers when available, and explain technical terms clearly.
+If the information is not in the provided chunks, clearly state that.
+Provide a clear, well-structured answer."""
+
+USER_PROMPT_TEMPLATE = """Question: {query}
+
+Regulation chunks:
+{context}
+
+Provide a clear, well-structured answer:"""
+
+CHUNK_TEMPLATE = "[Chunk {idx} - Relevance: {score:.4f}]\n{text}\n"
+
+
 def bedrock_retrieve_chunks(query: str, num_results: int = 5):
     """Retrieve chunks from Bedrock Knowledge Base."""
     bedrock_agent = boto3.client(
@@ -55,33 +69,18 @@ def gpt4o_generate(query: str, chunks: list):
     """Generate answer using GPT-4o."""
     client = OpenAI(api_key=settings.openai_api_key)
     
-    # Build context
-    context_parts = []
-    for idx, chunk in enumerate(chunks, 1):
-        context_parts.append(
-            f"[Chunk {idx} - Relevance: {chunk['score']:.4f}]\n{chunk['text']}\n"
-        )
-    context = "\n".join(context_parts)
-    
-    system_prompt = """You are an expert F1 regulations assistant with deep knowledge of FIA Formula 1 rules.
-
-Answer the question based ONLY on the provided regulation chunks.
-Be precise, cite article numbers when available, and explain technical terms clearly.
-If the information is not in the provided chunks, clearly state that.
-Provide a clear, well-structured answer."""
-
-    user_prompt = f"""Question: {query}
-
-Regulation chunks:
-{context}
-
-Provide a clear, well-structured answer:"""
+    # Build context in a single join
+    context = "\n".join(
+        CHUNK_TEMPLATE.format(idx=idx, score=chunk['score'], text=chunk['text'])
+        for idx, chunk in enumerate(chunks, 1)
+    )
+    user_prompt = USER_PROMPT_TEMPLATE.format(query=query, context=context)
     
     start = time.time()
     response = client.chat.completions.create(
         model="gpt-4o",
         messages=[
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt}
         ],
         max_tokens=1500,
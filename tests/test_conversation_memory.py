@@ -3,10 +3,6 @@ Test conversation memory with follow-up questions.
 Demonstrates how the orchestrator uses conversation history for context.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 from loguru import logger
 from src.agents.orchestrator import get_orchestrator
 from src.utils.logger import setup_logger
@@ -3,10 +3,6 @@ Latency comparison test: Bedrock Retrieve + OpenAI Generate
 Shows retrieved chunks and measures performance tradeoff.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 from loguru import logger
 from src.agents.orchestrator import get_orchestrator
 
@@ -59,6 +55,12 @@ def main():
     # Initialize orchestrator
     print("Initializing orchestrator...")
     orchestrator = get_orchestrator()
+    
+    # Untimed warm-up: connection pool / TLS setup shouldn't skew the first test
+    try:
+        orchestrator.process_query("ping")
+    except Exception as e:
+        logger.warning(f"Warm-up query failed: {e}")
     print("✓ Orchestrator ready\n")
     
     # Test queries
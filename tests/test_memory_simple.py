@@ -2,10 +2,6 @@
 Quick test of conversation memory with circuit queries only (fast, no Bedrock).
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 from loguru import logger
 from src.agents.orchestrator import get_orchestrator
 from src.utils.logger import setup_logger
@@ -3,10 +3,6 @@ Multi-Model Latency Comparison Test
 Compares: GPT-5 Mini, GPT-5 Nano, GPT-4o, GPT-4o-mini, Bedrock Claude
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 import time
 from openai import OpenAI
 import boto3
@@ -14,6 +10,19 @@ from loguru import logger
 from src.config.settings import settings
 
 
+# Prompt pieces for the Retrieve + OpenAI path, built once at import
+SYSTEM_PROMPT = "You are an expert F1 regulations assistant. Answer based on the provided chunks."
+
+USER_PROMPT_TEMPLATE = """Question: {query}
+
+Regulation chunks:
+{context}
+
+Provide a clear answer:"""
+
+CHUNK_TEMPLATE = "[Chunk {idx} - Score: {score:.4f}]\n{text}\n"
+
+
 def test_bedrock_retrieve(query: str, num_results: int = 5):
     """Test Bedrock retrieval speed."""
     bedrock_agent = boto3.client(
@@ -55,11 +64,12 @@ def test_openai_generation(model: str, query: str, chunks: list):
     """Test OpenAI generation speed for a specific model."""
     client = OpenAI(api_key=settings.openai_api_key)
     
-    # Build context
-    context_parts = []
-    for idx, chunk in enumerate(chunks, 1):
-        context_parts.append(f"[Chunk {idx} - Score: {chunk['score']:.4f}]\n{chunk['text']}\n")
-    context = "\n".join(context_parts)
+    # Build context in a single join
+    context = "\n".join(
+        CHUNK_TEMPLATE.format(idx=idx, score=chunk['score'], text=chunk['text'])
+        for idx, chunk in enumerate(chunks, 1)
+    )
+    user_prompt = USER_PROMPT_TEMPLATE.format(query=query, context=context)
     
     # GPT-5 and o1 models have different requirements
     is_gpt5 = model.startswith('gpt-5')
@@ -68,26 +78,11 @@ def test_openai_generation(model: str, query: str, chunks: list):
     # Build messages based on model type
     if is_o1 or is_gpt5:
         # o1 and GPT-5 models don't support system messages
-        user_prompt = f"""You are an expert F1 regulations assistant. Answer based on the provided chunks.
-
-Question: {query}
-
-Regulation chunks:
-{context}
-
-Provide a clear answer:"""
-        messages = [{"role": "user", "content": user_prompt}]
+        messages = [{"role": "user", "content": f"{SYSTEM_PROMPT}\n\n{user_prompt}"}]
     else:
         # GPT-4o models support system messages
-        system_prompt = """You are an expert F1 regulations assistant. Answer based on the provided chunks."""
-        user_prompt = f"""Question: {query}
-
-Regulation chunks:
-{context}
-
-Provide a clear answer:"""
         messages = [
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt}
         ]
     
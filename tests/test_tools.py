@@ -1,9 +1,4 @@
 """Test individual tool initialization"""
-import sys
-import os
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 from src.utils.logger import setup_logger
 from loguru import logger
 